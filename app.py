@@ -7,11 +7,16 @@ Normativa: IESS CD 513 Ecuador
 Autor: Arquitecto de Software Senior
 """
 
+import io
+import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import streamlit.components.v1 as components
 
 # Importaciones de módulos propios
 from modules import (
@@ -23,7 +28,7 @@ from modules import (
     TipoAnalisis,
     SSOVisualizer
 )
-from modules.pdf_generator import generar_informe_reactivos, generar_informe_proactivos
+from modules.data_manager import leer_excel
 
 # ============================================================================
 # CONFIGURACIÓN DE LA PÁGINA
@@ -36,156 +41,56 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Inyectar script de Iconify (CDN)
-# Usamos el componente HTML para asegurar que el script se cargue
-st.markdown(
-    """
-    <script src="https://code.iconify.design/iconify-icon/1.0.7/iconify-icon.min.js"></script>
-    """,
-    unsafe_allow_html=True
-)
-
-# Estilos CSS Profesionales (Badges, Chips, Tipografía)
-st.markdown("""
-<style>
-    /* Importar fuente Inter */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-    html, body, [class*="css"] {
-        font-family: 'Inter', 'Segoe UI', sans-serif;
-    }
+# Recursos estáticos servidos por Streamlit en app/static/. El sprite de iconos va en el
+# repositorio; la fuente Inter es opcional: solo existe si se ejecutó descargar_recursos.py.
+# Sin ella (checkout nuevo) la fuente se carga desde Google Fonts
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+INTER_LOCAL = os.path.exists(os.path.join(STATIC_DIR, 'fonts', 'InterVariable.woff2'))
 
-    /* --- COMPONENTES: BADGES & CHIPS --- */
-    .sso-badge {
-        display: inline-flex;
-        align-items: center;
-        gap: 6px;
-        padding: 4px 12px;
-        border-radius: 20px;
-        font-size: 0.85rem;
-        font-weight: 600;
-        letter-spacing: 0.02em;
-        line-height: 1.5;
-        white-space: nowrap;
-        transition: all 0.2s ease;
-    }
-    
-    .sso-badge iconify-icon {
-        font-size: 1.1em;
-        vertical-align: text-bottom;
-    }
 
-    /* Variantes de Badges */
-    .badge-primary {
-        background-color: #e3f2fd;
-        color: #1565c0;
-        border: 1px solid #bbdefb;
-    }
-    
-    .badge-success {
-        background-color: #e8f5e9;
-        color: #2e7d32;
-        border: 1px solid #c8e6c9;
-    }
-    
-    .badge-warning {
-        background-color: #fff3e0;
-        color: #ef6c00;
-        border: 1px solid #ffe0b2;
-    }
-    
-    .badge-danger {
-        background-color: #ffebee;
-        color: #c62828;
-        border: 1px solid #ffcdd2;
-    }
-    
-    .badge-neutral {
-        background-color: #f5f5f5;
-        color: #616161;
-        border: 1px solid #e0e0e0;
-    }
-
-    /* --- HEADER PRINCIPAL --- */
-    .app-header {
-        display: flex;
-        align-items: center;
-        padding: 20px 0;
-        border-bottom: 2px solid #f0f2f6;
-        margin-bottom: 30px;
-        background: white;
-    }
+@st.cache_resource
+def cargar_sprite_iconos() -> str:
+    """Lee una sola vez el sprite SVG con los iconos usados en la app"""
+    ruta = os.path.join(STATIC_DIR, 'iconos.svg')
+    if os.path.exists(ruta):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return f.read()
+    return ''
 
-    .app-header-icon {
-        font-size: 48px;
-        color: #1f77b4;
-        margin-right: 20px;
-        filter: drop-shadow(0 4px 6px rgba(31, 119, 180, 0.2));
-    }
 
-    .app-header-title h1 {
-        margin: 0;
-        font-size: 2.2rem;
-        color: #2c3e50;
-        font-weight: 700;
-    }
+# Sprite de iconos inline: se referencian con <use href="#prefijo-nombre"/>
+st.markdown(cargar_sprite_iconos(), unsafe_allow_html=True)
 
-    .app-header-subtitle {
-        color: #7f8c8d;
-        font-size: 1.1rem;
-        margin-top: 5px;
-    }
+# Fuente Inter: @font-face local si se descargó (sin cadena CSS -> Google Fonts); si no, CDN
+if INTER_LOCAL:
+    st.markdown("""
+    <link rel="preload" href="app/static/fonts/InterVariable.woff2" as="font" type="font/woff2" crossorigin>
+    <style>
+        @font-face {
+            font-family: 'Inter';
+            font-style: normal;
+            font-weight: 300 700;
+            font-display: swap;
+            src: local('Inter'), url('app/static/fonts/InterVariable.woff2') format('woff2');
+        }
+    </style>
+    """, unsafe_allow_html=True)
+else:
+    st.markdown("""
+    <style>
+        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
+    </style>
+    """, unsafe_allow_html=True)
 
-    /* --- TARJETAS METRICAS --- */
-    .kpi-card {
-        background: white;
-        border-radius: 12px;
-        padding: 24px;
-        border: 1px solid #f0f0f0;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.03);
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-    }
-    
-    .kpi-card:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 20px rgba(0,0,0,0.06);
-        border-color: #e0e0e0;
-    }
+@st.cache_resource
+def cargar_estilos() -> str:
+    """Lee una sola vez la hoja de estilos de la app (badges, chips, tipografía)"""
+    with open(os.path.join(STATIC_DIR, 'app.css'), 'r', encoding='utf-8') as f:
+        return f"<style>\n{f.read()}</style>"
 
-    /* --- SIDEBAR PERSONALIZADO --- */
-    [data-testid="stSidebar"] {
-        background-color: #f8f9fa;
-        border-right: 1px solid #e9ecef;
-    }
-    
-    /* --- TABS --- */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 20px;
-        border-bottom: 2px solid #e9ecef;
-        padding-bottom: 2px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        background-color: transparent !important;
-        border: none !important;
-        font-weight: 600;
-        color: #6c757d;
-        padding-bottom: 12px;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        color: #1f77b4 !important;
-        border-bottom: 3px solid #1f77b4 !important;
-    }
 
-    /* Utilitarios */
-    .flex-center {
-        display: flex;
-        align-items: center;
-        gap: 8px;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Estilos CSS Profesionales (Badges, Chips, Tipografía)
+st.markdown(cargar_estilos(), unsafe_allow_html=True)
 
 # ============================================================================
 # INICIALIZACIÓN DE COMPONENTES
@@ -206,9 +111,15 @@ componentes = inicializar_componentes()
 # FUNCIONES AUXILIARES UI
 # ============================================================================
 
+def icono(icon: str, clase: str = 'ico', estilo: str = '') -> str:
+    """Genera HTML para un icono del sprite (formato 'prefijo:nombre')"""
+    estilo_html = f' style="{estilo}"' if estilo else ''
+    return f'<svg class="{clase}"{estilo_html}><use href="#{icon.replace(":", "-")}"/></svg>'
+
+
 def badge(texto: str, tipo: str = 'neutral', icon: str = None) -> str:
     """Genera HTML para un badge"""
-    icon_html = f'<iconify-icon icon="{icon}"></iconify-icon>' if icon else ''
+    icon_html = icono(icon) if icon else ''
     return f'<span class="sso-badge badge-{tipo}">{icon_html} {texto}</span>'
 
 
@@ -289,22 +200,35 @@ def render_pdf_config(key_prefix: str):
 # FUNCIONES DE PROCESAMIENTO DE DATOS
 # ============================================================================
 
+def _porcentaje(numerador: np.ndarray, denominador: np.ndarray) -> np.ndarray:
+    """(numerador / denominador) * 100 elemento a elemento; 0 donde el denominador no es positivo"""
+    resultado = np.zeros(numerador.shape, dtype=np.float64)
+    np.divide(numerador, denominador, out=resultado, where=denominador > 0)
+    resultado *= 100
+    resultado[np.isnan(resultado)] = 0.0
+    return resultado
+
+
+# Fórmulas vectorizadas: reciben {columna: np.ndarray float64} y retornan un np.ndarray
 INDICADORES_PROACTIVOS = {
-    'IART': {'cols': ['mes', 'narp', 'nart'], 'formula': lambda r: (r['nart'] / r['narp']) * 100 if r['narp'] > 0 else 0},
-    'OPAS': {'cols': ['mes', 'opasp', 'pobp', 'opasr', 'pc'], 'formula': lambda r: (r['opasr'] * r['pc']) / (r['opasp'] * r['pobp']) * 100 if (r['opasp'] * r['pobp']) > 0 else 0},
-    'IDS': {'cols': ['mes', 'ncsd', 'ncse'], 'formula': lambda r: (r['ncse'] / r['ncsd']) * 100 if r['ncsd'] > 0 else 0},
-    'IDPS': {'cols': ['mes', 'dpsp', 'pp', 'dpsr', 'nas'], 'formula': lambda r: (r['dpsr'] * r['nas']) / (r['dpsp'] * r['pp']) * 100 if (r['dpsp'] * r['pp']) > 0 else 0},
-    'IENTS': {'cols': ['mes', 'nteep', 'nee'], 'formula': lambda r: (r['nee'] / r['nteep']) * 100 if r['nteep'] > 0 else 0},
-    'IOSEA': {'cols': ['mes', 'oseaa', 'oseac'], 'formula': lambda r: (r['oseac'] / r['oseaa']) * 100 if r['oseaa'] > 0 else 0},
-    'ICAI': {'cols': ['mes', 'nmp', 'nmi'], 'formula': lambda r: (r['nmi'] / r['nmp']) * 100 if r['nmp'] > 0 else 0},
-    'IEF': {'cols': ['mes', 'capp', 'cape'], 'formula': lambda r: (r['cape'] / r['capp']) * 100 if r['capp'] > 0 else 0},
+    'IART': {'cols': ['mes', 'narp', 'nart'], 'formula': lambda v: _porcentaje(v['nart'], v['narp'])},
+    'OPAS': {'cols': ['mes', 'opasp', 'pobp', 'opasr', 'pc'], 'formula': lambda v: _porcentaje(v['opasr'] * v['pc'], v['opasp'] * v['pobp'])},
+    'IDS': {'cols': ['mes', 'ncsd', 'ncse'], 'formula': lambda v: _porcentaje(v['ncse'], v['ncsd'])},
+    'IDPS': {'cols': ['mes', 'dpsp', 'pp', 'dpsr', 'nas'], 'formula': lambda v: _porcentaje(v['dpsr'] * v['nas'], v['dpsp'] * v['pp'])},
+    'IENTS': {'cols': ['mes', 'nteep', 'nee'], 'formula': lambda v: _porcentaje(v['nee'], v['nteep'])},
+    'IOSEA': {'cols': ['mes', 'oseaa', 'oseac'], 'formula': lambda v: _porcentaje(v['oseac'], v['oseaa'])},
+    'ICAI': {'cols': ['mes', 'nmp', 'nmi'], 'formula': lambda v: _porcentaje(v['nmi'], v['nmp'])},
+    'IEF': {'cols': ['mes', 'capp', 'cape'], 'formula': lambda v: _porcentaje(v['cape'], v['capp'])},
 }
 
+# Columnas de datos (sin 'mes') de cada indicador, resueltas una sola vez al importar
+COLUMNAS_DATOS_PROACTIVOS = {ind: tuple(cfg['cols'][1:]) for ind, cfg in INDICADORES_PROACTIVOS.items()}
 
-def procesar_excel_reactivo(uploaded_file) -> pd.DataFrame:
-    """Procesa Excel de reactivos (hoja única)"""
+
+def procesar_excel_reactivo(uploaded_file) -> tuple:
+    """Procesa Excel de reactivos (hoja única). Retorna (DataFrame, mensaje de error)"""
     try:
-        df = pd.read_excel(uploaded_file, sheet_name=0)
+        df = leer_excel(uploaded_file, sheet_name=0)
         
         # Columnas de entrada (no calculadas)
         cols_entrada = [
@@ -315,19 +239,25 @@ def procesar_excel_reactivo(uploaded_file) -> pd.DataFrame:
         # Verificar columnas
         cols_faltantes = [c for c in cols_entrada if c not in df.columns]
         if cols_faltantes:
-            st.error(f"Columnas faltantes: {', '.join(cols_faltantes)}")
-            return None
+            return None, f"Columnas faltantes: {', '.join(cols_faltantes)}"
         
-        df = df[cols_entrada].copy()
-        df = df.dropna(subset=['mes'])
+        # Filtrar filas sin mes y seleccionar columnas en una sola indexación
+        df = df.loc[df['mes'].notna(), cols_entrada]
         
-        # Convertir a numérico
+        # Convertir a numérico con el tipo más compacto: conteos en int32 (redondeados, no
+        # truncados); horas y días perdidos (admiten medias jornadas) en float32
         for col in cols_entrada[1:]:  # Excepto 'mes'
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            valores = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            if col.startswith('horas') or col == 'dias_perdidos':
+                df[col] = valores.astype(np.float32)
+            else:
+                df[col] = valores.round().astype(np.int32)
         
         # Calcular campos derivados
         # Total Horas Trabajadas = num_trabajadores * horas_trabajador + horas_extras
-        df['horas_hombre_mes'] = df['num_trabajadores'] * df['horas_trabajador'] + df['horas_extras']
+        df['horas_hombre_mes'] = (
+            df['num_trabajadores'] * df['horas_trabajador'] + df['horas_extras']
+        ).astype(np.float32)
         
         # Renombrar para coincidir con ReactiveAnalyzer
         df = df.rename(columns={
@@ -335,47 +265,56 @@ def procesar_excel_reactivo(uploaded_file) -> pd.DataFrame:
             'enf_ocupacional': 'enf_ocupacionales'
         })
         
-        return df
+        return df, None
     except Exception as e:
-        st.error(f"Error: {str(e)}")
-        return None
+        return None, f"Error: {str(e)}"
 
 
-def procesar_excel_proactivo(uploaded_file) -> dict:
-    """Procesa Excel de proactivos (múltiples hojas)"""
+def procesar_excel_proactivo(uploaded_file) -> tuple:
+    """Procesa Excel de proactivos (múltiples hojas). Retorna (datos, mensaje de error)"""
     try:
-        excel = pd.ExcelFile(uploaded_file)
-        hojas_disponibles = excel.sheet_names
+        # Leer todas las hojas en una sola pasada por el libro
+        hojas = leer_excel(uploaded_file, sheet_name=None)
+        hojas_upper = {hoja.upper(): hoja for hoja in hojas}
         
         datos = {}
-        hojas_encontradas = []
         
         for indicador, config in INDICADORES_PROACTIVOS.items():
-            # Buscar hoja (puede ser nombre exacto o parcial)
-            hoja_match = None
-            for hoja in hojas_disponibles:
-                if indicador.upper() in hoja.upper():
-                    hoja_match = hoja
-                    break
+            # Buscar hoja: primero nombre exacto (O(1)), luego coincidencia parcial
+            hoja_match = hojas_upper.get(indicador) or next(
+                (hoja for nombre, hoja in hojas_upper.items() if indicador in nombre), None
+            )
             
             if hoja_match:
-                df = pd.read_excel(excel, sheet_name=hoja_match)
+                df = hojas[hoja_match]
                 
                 # Verificar columnas mínimas
                 cols_presentes = [c for c in config['cols'] if c in df.columns]
                 if len(cols_presentes) >= 2:  # Al menos mes + 1 dato
-                    datos[indicador] = df[cols_presentes].dropna(subset=['mes']).copy()
-                    hojas_encontradas.append(indicador)
+                    datos[indicador] = df.loc[df['mes'].notna(), cols_presentes]
         
-        if hojas_encontradas:
-            st.markdown(badge(f"Hojas detectadas: {', '.join(hojas_encontradas)}", "success", "lucide:check-circle"), unsafe_allow_html=True)
-        else:
-            st.warning("No se detectaron hojas de indicadores proactivos")
-        
-        return datos
+        return datos, None
     except Exception as e:
-        st.error(f"Error: {str(e)}")
-        return {}
+        return {}, f"Error: {str(e)}"
+
+
+def _parse_si_cambia(uploaded_file, parser, clave: str) -> tuple:
+    """
+    Parsea el archivo solo cuando su contenido cambia (huella blake2b en session_state).
+    Única capa de caché: el resultado vive solo en la sesión, sin copia global en el servidor.
+    """
+    contenido = uploaded_file.getvalue()
+    huella = hashlib.blake2b(contenido, digest_size=8).hexdigest()
+    if st.session_state.get(f'{clave}_hash') != huella:
+        st.session_state[f'{clave}_parse'] = parser(io.BytesIO(contenido))
+        st.session_state[f'{clave}_hash'] = huella
+    return st.session_state[f'{clave}_parse']
+
+
+def _hoja_con_datos(df: pd.DataFrame) -> bool:
+    """True si la hoja tiene algún valor distinto de cero (las plantillas vienen en cero)"""
+    valores = df.drop(columns='mes', errors='ignore').apply(pd.to_numeric, errors='coerce')
+    return bool(valores.fillna(0).to_numpy().any())
 
 
 def calcular_indicadores_proactivos(datos_raw: dict) -> pd.DataFrame:
@@ -387,39 +326,53 @@ def calcular_indicadores_proactivos(datos_raw: dict) -> pd.DataFrame:
     primer_indicador = list(datos_raw.values())[0]
     meses = primer_indicador['mes'].tolist()
     
-    resultado = pd.DataFrame({'mes': meses})
-    
-    for indicador, config in INDICADORES_PROACTIVOS.items():
-        if indicador in datos_raw:
-            df = datos_raw[indicador]
-            valores = []
-            for _, row in df.iterrows():
-                try:
-                    valor = config['formula'](row)
-                    valores.append(min(100, max(0, valor)))  # Limitar 0-100
-                except:
-                    valores.append(0)
-            resultado[indicador.lower()] = valores[:len(meses)]
+    # Construir todas las columnas primero y crear el DataFrame una sola vez
+    indice = pd.RangeIndex(len(meses))
+    columnas = {'mes': meses}
+    
+    # Indicadores presentes, en el orden de INDICADORES_PROACTIVOS
+    presentes = [ind for ind in INDICADORES_PROACTIVOS if ind in datos_raw]
+    
+    # Apilar los datos de todos los indicadores en una sola tabla (columnas (indicador, campo),
+    # filas alineadas por posición) y convertirla a una matriz float64 de una vez.
+    # Columnas faltantes o valores no numéricos se tratan como 0
+    tabla = pd.concat(
+        [datos_raw[ind].reindex(columns=COLUMNAS_DATOS_PROACTIVOS[ind]).reset_index(drop=True) for ind in presentes],
+        axis=1, keys=presentes
+    ).apply(pd.to_numeric, errors='coerce')
+    matriz = tabla.to_numpy(dtype=np.float64, na_value=np.nan)
+    posicion = {clave: j for j, clave in enumerate(tabla.columns)}
+    
+    for indicador in presentes:
+        arrays = {col: matriz[:, posicion[(indicador, col)]] for col in COLUMNAS_DATOS_PROACTIVOS[indicador]}
+        calculado = INDICADORES_PROACTIVOS[indicador]['formula'](arrays)
+        
+        # Alinear por posición con los meses del primer indicador (solo las filas propias del indicador)
+        valores = np.full(len(meses), np.nan)
+        n = min(len(meses), len(datos_raw[indicador]))
+        valores[:n] = calculado[:n]
+        columnas[indicador.lower()] = np.clip(valores, 0.0, 100.0)  # Limitar 0-100
     
     # Calcular IG Total (ponderado según CD 513)
     pesos = {'iart': 5, 'opas': 3, 'idps': 2, 'ids': 3, 'ients': 4, 'iosea': 4, 'icai': 4}
     suma_pesos = sum(pesos.values())
     
-    def calcular_ig(row):
-        total = 0
-        for ind, peso in pesos.items():
-            if ind in row.index and pd.notna(row[ind]):
-                total += row[ind] * peso
-        return total / suma_pesos
+    cols = [c for c in pesos if c in columnas]
+    matriz = np.zeros((len(meses), len(cols)), dtype=np.float64)
+    for j, c in enumerate(cols):
+        matriz[:, j] = columnas[c]
+    matriz = np.nan_to_num(matriz, nan=0.0)
+    vector_pesos = np.array([pesos[c] for c in cols], dtype=np.float64)
+    columnas['ig_total'] = matriz @ vector_pesos / suma_pesos
     
-    resultado['ig_total'] = resultado.apply(calcular_ig, axis=1)
+    resultado = pd.DataFrame(columnas, index=indice)
     
     return resultado
 
 
+@st.cache_resource
 def cargar_plantilla(nombre: str) -> bytes:
-    """Carga una plantilla como bytes para descarga"""
-    import os
+    """Carga una plantilla como bytes para descarga (una sola lectura por proceso)"""
     ruta = os.path.join('templates', nombre)
     if os.path.exists(ruta):
         with open(ruta, 'rb') as f:
@@ -437,7 +390,7 @@ def render_sidebar():
         # Logo
         st.markdown("""
             <div style="text-align: center; padding: 20px 0;">
-                <iconify-icon icon="mdi:shield-check-outline" style="font-size: 80px; color: #1f77b4;"></iconify-icon>
+                <svg class="ico" style="font-size: 80px; color: #1f77b4;"><use href="#mdi-shield-check-outline"/></svg>
                 <div style="font-weight: 700; font-size: 1.2rem; color: #333; margin-top: 10px;">
                     SSO MANAGEMENT
                 </div>
@@ -484,8 +437,10 @@ def render_sidebar():
         )
         
         if archivo_reactivo:
-            df = procesar_excel_reactivo(archivo_reactivo)
-            if df is not None:
+            df, error = _parse_si_cambia(archivo_reactivo, procesar_excel_reactivo, 'reactivo')
+            if error:
+                st.error(error)
+            else:
                 st.session_state['df_reactivo_raw'] = df
         
         # Proactivos
@@ -498,14 +453,19 @@ def render_sidebar():
         )
         
         if archivo_proactivo:
-            datos = procesar_excel_proactivo(archivo_proactivo)
-            if datos:
+            datos, error = _parse_si_cambia(archivo_proactivo, procesar_excel_proactivo, 'proactivo')
+            if error:
+                st.error(error)
+            elif datos:
+                st.markdown(badge(f"Hojas detectadas: {', '.join(datos)}", "success", "lucide:check-circle"), unsafe_allow_html=True)
                 st.session_state['datos_proactivos_raw'] = datos
+            else:
+                st.warning("No se detectaron hojas de indicadores proactivos")
         
         st.markdown("---")
         
         # --- CONSTANTES K ---
-        st.markdown(f"### {badge('Constantes K', 'neutral', 'tb:math-function')}", unsafe_allow_html=True)
+        st.markdown(f"### {badge('Constantes K', 'neutral', 'tabler:math-function')}", unsafe_allow_html=True)
         with st.expander("Configurar", expanded=False):
             k_mensual = st.number_input("K Mensual", value=16666.67, format="%.2f")
             k_trimestral = st.number_input("K Trimestral", value=50000.00, format="%.2f")
@@ -532,14 +492,183 @@ def render_sidebar():
         }
 
 
+# ============================================================================
+# CÁLCULOS CACHEADOS (solo se recalculan si cambian los datos de entrada)
+# ============================================================================
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def procesar_reactivo_cache(df: pd.DataFrame, constantes_k: ConstantesK) -> tuple:
+    """Ejecuta el análisis reactivo; retorna (df_reporte, df_charts)"""
+    analyzer = ReactiveAnalyzer()
+    analyzer.constantes = constantes_k
+    return analyzer.procesar(df)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def calcular_proactivos_cache(datos_raw: dict) -> pd.DataFrame:
+    """Versión cacheada de calcular_indicadores_proactivos"""
+    return calcular_indicadores_proactivos(datos_raw)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def exportar_excel_cache(_visualizer: SSOVisualizer, df_reactivo: pd.DataFrame = None,
+                         df_proactivo: pd.DataFrame = None) -> bytes:
+    """Genera el reporte Excel; el visualizador no forma parte de la clave de caché"""
+    return _visualizer.exportar_a_excel(df_reactivo=df_reactivo, df_proactivo=df_proactivo)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def imagenes_reactivas_cache(_visualizer: SSOVisualizer, df_charts: pd.DataFrame) -> dict:
+    """Gráficos PNG del informe reactivo; no dependen de los datos de empresa del PDF"""
+    return _visualizer.generar_imagenes_reactivas(df_charts)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def imagenes_proactivas_cache(_visualizer: SSOVisualizer, df_resultado: pd.DataFrame, metas: dict) -> dict:
+    """Gráficos PNG del informe proactivo; no dependen de los datos de empresa del PDF"""
+    return _visualizer.generar_imagenes_proactivas(df_resultado, metas)
+
+
+def informe_reactivos_pdf(visualizer: SSOVisualizer, df_charts: pd.DataFrame,
+                          metricas: dict, pdf_config: dict) -> bytes:
+    """
+    Genera el informe PDF reactivo (fpdf se importa solo al generar informes).
+    Sin caché: el PDF lleva la fecha y hora de emisión; solo los gráficos se cachean.
+    """
+    from modules.pdf_generator import generar_informe_reactivos
+    return generar_informe_reactivos(
+        df_charts=df_charts,
+        metricas=metricas,
+        datos_empresa=pdf_config['datos_empresa'],
+        datos_responsable=pdf_config['datos_responsable'],
+        datos_aprobacion=pdf_config['datos_aprobacion'],
+        imagenes=imagenes_reactivas_cache(visualizer, df_charts),
+        periodo=pdf_config['periodo'],
+        codigo=pdf_config['codigo'],
+        version=pdf_config['version']
+    )
+
+
+def informe_proactivos_pdf(visualizer: SSOVisualizer, df_resultado: pd.DataFrame,
+                           metas: dict, pdf_config: dict) -> bytes:
+    """
+    Genera el informe PDF proactivo (fpdf se importa solo al generar informes).
+    Sin caché: el PDF lleva la fecha y hora de emisión; solo los gráficos se cachean.
+    """
+    from modules.pdf_generator import generar_informe_proactivos
+    return generar_informe_proactivos(
+        df_resultados=df_resultado,
+        metas=metas,
+        datos_empresa=pdf_config['datos_empresa'],
+        datos_responsable=pdf_config['datos_responsable'],
+        datos_aprobacion=pdf_config['datos_aprobacion'],
+        imagenes=imagenes_proactivas_cache(visualizer, df_resultado, metas),
+        periodo=pdf_config['periodo'],
+        codigo=pdf_config['codigo'],
+        version=pdf_config['version']
+    )
+
+
+def generar_en_paralelo(*tareas) -> list:
+    """
+    Ejecuta tareas independientes en hilos propios de esta llamada y retorna sus resultados en orden.
+    El pool no se comparte entre sesiones (una generación no hace esperar a otros usuarios) y sus
+    hilos terminan al salir del bloque, llevándose el contexto de la sesión que recibieron para
+    que st.cache_data funcione. Varias tareas pueden generar gráficos a la vez: SSOVisualizer no usa
+    pyplot, toma Figures propias de la llamada del pool bajo _FIG_POOL_LOCK y serializa
+    tight_layout/savefig con _RENDER_LOCK.
+    """
+    ctx = get_script_run_ctx()
+    
+    def con_contexto(tarea):
+        def ejecutar():
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return tarea()
+        return ejecutar
+    
+    with ThreadPoolExecutor(max_workers=len(tareas), thread_name_prefix='informes') as pool:
+        futuros = [pool.submit(con_contexto(tarea)) for tarea in tareas]
+        return [futuro.result() for futuro in futuros]
+
+
 # ============================================================================
 # TABS PRINCIPALES
 # ============================================================================
 
-def render_tab_reactivos(constantes_k: ConstantesK):
-    """Renderiza el tab de indicadores reactivos con tabla editable"""
+@st.fragment
+def render_descargas_reactivos(df_reporte: pd.DataFrame, df_charts: pd.DataFrame, metricas: dict,
+                               fecha_str: str):
+    """Formulario del informe y botones de descarga reactivos (fragmento anidado en el tab)"""
+    st.markdown("### Descargar Informes")
+    
+    # Configuración del informe PDF (inline)
+    pdf_config = render_pdf_config("reactivos")
+    
+    try:
+        # Excel (openpyxl) e informe PDF (gráficos + fpdf) son independientes: se generan a la vez
+        excel_data, pdf_data = generar_en_paralelo(
+            lambda: exportar_excel_cache(componentes['visualizer'], df_reactivo=df_reporte),
+            lambda: informe_reactivos_pdf(componentes['visualizer'], df_charts, metricas, pdf_config),
+        )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="Descargar Reporte Excel",
+                data=excel_data,
+                file_name=f"reporte_reactivos_{fecha_str}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                use_container_width=True
+            )
+        with col2:
+            st.download_button(
+                label="Descargar Informe PDF",
+                data=pdf_data,
+                file_name=f"informe_reactivos_{fecha_str}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
+    except Exception as e:
+        st.error(f"Error: {str(e)}")
+
+
+@st.fragment
+def render_descargas_proactivos(df_resultado: pd.DataFrame, metas: dict, fecha_str: str):
+    """Formulario del informe y botones de descarga proactivos (fragmento anidado en el tab)"""
+    st.markdown("### Descargar Informes")
+    
+    # Configuración del informe PDF (inline)
+    pdf_config = render_pdf_config("proactivos")
+    
+    excel_data, pdf_data = generar_en_paralelo(
+        lambda: exportar_excel_cache(componentes['visualizer'], df_proactivo=df_resultado),
+        lambda: informe_proactivos_pdf(componentes['visualizer'], df_resultado, metas, pdf_config),
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="Descargar Reporte Excel",
+            data=excel_data,
+            file_name=f"reporte_proactivos_{fecha_str}.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            use_container_width=True
+        )
+    with col2:
+        st.download_button(
+            label="Descargar Informe PDF",
+            data=pdf_data,
+            file_name=f"informe_proactivos_{fecha_str}.pdf",
+            mime="application/pdf",
+            use_container_width=True
+        )
+
+
+@st.fragment
+def render_tab_reactivos(constantes_k: ConstantesK, fecha_str: str):
+    """Renderiza el tab de indicadores reactivos con tabla editable (fragmento: al editar solo se re-ejecuta este tab)"""
     st.markdown(f"""
-    ## <div class='flex-center'><iconify-icon icon='lucide:alert-triangle' style='color:#e74c3c'></iconify-icon> Indicadores Reactivos</div>
+    ## <div class='flex-center'>{icono('lucide:alert-triangle', estilo='color:#e74c3c')} Indicadores Reactivos</div>
     """, unsafe_allow_html=True)
     
     # Verificar si hay datos
@@ -558,7 +687,9 @@ def render_tab_reactivos(constantes_k: ConstantesK):
         """)
         return
     
-    df_raw = st.session_state['df_reactivo_raw'].copy()
+    # DataFrame parseado (solo lo escribe la barra lateral al cargar un archivo). Sin copias explícitas:
+    # la selección de columnas ya es una vista copy-on-write y data_editor no muta su entrada
+    df_raw = st.session_state['df_reactivo_raw']
     
     # Columnas de entrada para edición (nombres que usa ReactiveAnalyzer)
     cols_edicion = ['mes', 'num_trabajadores', 'horas_trabajador', 'horas_extras',
@@ -566,7 +697,7 @@ def render_tab_reactivos(constantes_k: ConstantesK):
     
     # Filtrar solo columnas de entrada para edición
     cols_disponibles = [c for c in cols_edicion if c in df_raw.columns]
-    df_editar = df_raw[cols_disponibles].copy()
+    df_editar = df_raw[cols_disponibles]
     
     # Tabla editable
     st.markdown(f"### {badge('Datos de Entrada', 'primary', 'lucide:table-2')} (Editable)", unsafe_allow_html=True)
@@ -584,33 +715,40 @@ def render_tab_reactivos(constantes_k: ConstantesK):
             "acc_baja": st.column_config.NumberColumn("Acc. c/Baja", min_value=0, format="%d"),
             "acc_sin_baja": st.column_config.NumberColumn("Acc. s/Baja", min_value=0, format="%d"),
             "enf_ocupacionales": st.column_config.NumberColumn("Enf. Ocup.", min_value=0, format="%d"),
-            "dias_perdidos": st.column_config.NumberColumn("Días Perd.", min_value=0, format="%d"),
+            "dias_perdidos": st.column_config.NumberColumn("Días Perd.", min_value=0, format="%.1f"),
         },
         key="reactivo_editor"
     )
     
-    # Recalcular campos derivados después de edición
-    edited_df['horas_hombre_mes'] = edited_df['num_trabajadores'] * edited_df['horas_trabajador'] + edited_df['horas_extras']
-    
-    # Actualizar session_state con datos editados
-    st.session_state['df_reactivo_raw'] = edited_df
+    # Recalcular campos derivados después de edición (una sola expresión evaluada por pandas/numexpr),
+    # en float32 como al cargar el archivo
+    edited_df['horas_hombre_mes'] = edited_df.eval(
+        'num_trabajadores * horas_trabajador + horas_extras'
+    ).astype(np.float32)
     
     st.markdown("---")
     
+    # Plantilla recién cargada (todas las entradas en cero): no hay índices que calcular ni graficar.
+    # Con trabajadores pero sin horas por trabajador sí se calcula: ReactiveAnalyzer estima las horas
+    if not edited_df.empty and not _hoja_con_datos(edited_df):
+        st.info("Ingrese el número de trabajadores y las horas por trabajador para calcular los indicadores.")
+        return
+    
     # Procesar y mostrar resultados
     if not edited_df.empty:
-        reactive_analyzer = componentes['reactive_analyzer']
-        reactive_analyzer.constantes = constantes_k
-        
         try:
-            df_reporte, df_charts = reactive_analyzer.procesar(edited_df)
+            df_reporte, df_charts = procesar_reactivo_cache(edited_df, constantes_k)
             
+            # Todas las reducciones en una sola pasada
+            agregados = df_charts.agg({
+                'total_lesiones': 'sum', 'dias_perdidos': 'sum', 'IF': 'mean', 'IG': 'mean', 'TR': 'mean'
+            })
             metricas = {
-                'total_lesiones': df_charts['total_lesiones'].sum(),
-                'total_dias': df_charts['dias_perdidos'].sum(),
-                'if_promedio': df_charts['IF'].mean(),
-                'ig_promedio': df_charts['IG'].mean(),
-                'tr_promedio': df_charts['TR'].mean()
+                'total_lesiones': agregados['total_lesiones'],
+                'total_dias': agregados['dias_perdidos'],
+                'if_promedio': agregados['IF'],
+                'ig_promedio': agregados['IG'],
+                'tr_promedio': agregados['TR']
             }
             
             componentes['visualizer'].render_metricas_resumen(metricas, tipo="reactivo")
@@ -619,58 +757,22 @@ def render_tab_reactivos(constantes_k: ConstantesK):
             componentes['visualizer'].render_reactive_dashboard(
                 df_reporte=df_reporte,
                 df_charts=df_charts,
-                titulo="<div class='flex-center'><iconify-icon icon='lucide:line-chart'></iconify-icon> Análisis</div>",
+                titulo=f"<div class='flex-center'>{icono('lucide:line-chart')} Análisis</div>",
                 mostrar_tabla=True,
                 mostrar_graficos=True
             )
             
-            # Descarga
-            st.markdown("### Descargar Informes")
-            
-            # Configuración del informe PDF (inline)
-            pdf_config = render_pdf_config("reactivos")
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                excel_data = componentes['visualizer'].exportar_a_excel(df_reactivo=df_reporte)
-                st.download_button(
-                    label="Descargar Reporte Excel",
-                    data=excel_data,
-                    file_name=f"reporte_reactivos_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
-            with col2:
-                # Generar imágenes para el PDF
-                img_graficos = componentes['visualizer'].generar_imagenes_reactivas(df_charts)
-                
-                # Generar PDF profesional
-                pdf_data = generar_informe_reactivos(
-                    df_charts=df_charts,
-                    metricas=metricas,
-                    datos_empresa=pdf_config['datos_empresa'],
-                    datos_responsable=pdf_config['datos_responsable'],
-                    datos_aprobacion=pdf_config['datos_aprobacion'],
-                    imagenes=img_graficos,
-                    periodo=pdf_config['periodo'],
-                    codigo=pdf_config['codigo'],
-                    version=pdf_config['version']
-                )
-                st.download_button(
-                    label="Descargar Informe PDF",
-                    data=pdf_data,
-                    file_name=f"informe_reactivos_{datetime.now().strftime('%Y%m%d')}.pdf",
-                    mime="application/pdf",
-                    use_container_width=True
-                )
+            # Descarga (fragmento propio: formulario PDF y botones no re-ejecutan el tab)
+            render_descargas_reactivos(df_reporte, df_charts, metricas, fecha_str)
         except Exception as e:
             st.error(f"Error: {str(e)}")
 
 
-def render_tab_proactivos(metas: dict):
-    """Renderiza el tab de indicadores proactivos con tablas editables"""
+@st.fragment
+def render_tab_proactivos(metas: dict, fecha_str: str):
+    """Renderiza el tab de indicadores proactivos con tablas editables (fragmento: al editar solo se re-ejecuta este tab)"""
     st.markdown(f"""
-    ## <div class='flex-center'><iconify-icon icon='lucide:shield-check' style='color:#2ecc71'></iconify-icon> Indicadores Proactivos</div>
+    ## <div class='flex-center'>{icono('lucide:shield-check', estilo='color:#2ecc71')} Indicadores Proactivos</div>
     """, unsafe_allow_html=True)
     
     # Verificar si hay datos
@@ -695,33 +797,38 @@ def render_tab_proactivos(metas: dict):
     
     indicadores_presentes = list(datos_raw.keys())
     
+    # Hojas editadas en un dict aparte: la entrada de cada editor debe seguir siendo la hoja
+    # parseada, o el widget cambiaría de identidad y descartaría las ediciones
+    datos_editados = {}
+    
     if indicadores_presentes:
         tabs_indicadores = st.tabs(indicadores_presentes)
         
         for i, indicador in enumerate(indicadores_presentes):
             with tabs_indicadores[i]:
-                df = datos_raw[indicador].copy()
-                
-                edited = st.data_editor(
-                    df,
+                datos_editados[indicador] = st.data_editor(
+                    datos_raw[indicador],
                     num_rows="dynamic",
                     use_container_width=True,
                     hide_index=True,
                     key=f"proactivo_{indicador}_editor"
                 )
-                
-                # Actualizar
-                st.session_state['datos_proactivos_raw'][indicador] = edited
     
     st.markdown("---")
     
+    # Plantilla recién cargada (todas las hojas en cero): no hay cumplimiento que calcular ni graficar
+    if not any(_hoja_con_datos(df) for df in datos_editados.values()):
+        st.info("Ingrese los valores de los indicadores para calcular el cumplimiento.")
+        return
+    
     # Calcular y mostrar resultados
-    df_resultado = calcular_indicadores_proactivos(st.session_state['datos_proactivos_raw'])
+    df_resultado = calcular_proactivos_cache(datos_editados)
     
     if not df_resultado.empty:
+        ig_promedio = df_resultado['ig_total'].mean() if 'ig_total' in df_resultado.columns else 0
         metricas = {
-            'ig_promedio': df_resultado['ig_total'].mean() if 'ig_total' in df_resultado.columns else 0,
-            'cumplimiento_general': df_resultado['ig_total'].mean() if 'ig_total' in df_resultado.columns else 0,
+            'ig_promedio': ig_promedio,
+            'cumplimiento_general': ig_promedio,
             'meses': len(df_resultado)
         }
         
@@ -731,50 +838,13 @@ def render_tab_proactivos(metas: dict):
         componentes['visualizer'].render_proactive_dashboard(
             df=df_resultado,
             metas=metas,
-            titulo="<div class='flex-center'><iconify-icon icon='lucide:clipboard-check'></iconify-icon> Cumplimiento</div>",
+            titulo=f"<div class='flex-center'>{icono('lucide:clipboard-check')} Cumplimiento</div>",
             mostrar_tabla=True,
             mostrar_graficos=True
         )
         
-        # Descarga
-        st.markdown("### Descargar Informes")
-        
-        # Configuración del informe PDF (inline)
-        pdf_config = render_pdf_config("proactivos")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            excel_data = componentes['visualizer'].exportar_a_excel(df_proactivo=df_resultado)
-            st.download_button(
-                label="Descargar Reporte Excel",
-                data=excel_data,
-                file_name=f"reporte_proactivos_{datetime.now().strftime('%Y%m%d')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-        with col2:
-            # Generar imágenes para el PDF
-            img_graficos = componentes['visualizer'].generar_imagenes_proactivas(df_resultado, metas)
-            
-            # Generar PDF profesional
-            pdf_data = generar_informe_proactivos(
-                df_resultados=df_resultado,
-                metas=metas,
-                datos_empresa=pdf_config['datos_empresa'],
-                datos_responsable=pdf_config['datos_responsable'],
-                datos_aprobacion=pdf_config['datos_aprobacion'],
-                imagenes=img_graficos,
-                periodo=pdf_config['periodo'],
-                codigo=pdf_config['codigo'],
-                version=pdf_config['version']
-            )
-            st.download_button(
-                label="Descargar Informe PDF",
-                data=pdf_data,
-                file_name=f"informe_proactivos_{datetime.now().strftime('%Y%m%d')}.pdf",
-                mime="application/pdf",
-                use_container_width=True
-            )
+        # Descarga (fragmento propio: formulario PDF y botones no re-ejecutan el tab)
+        render_descargas_proactivos(df_resultado, metas, fecha_str)
 
 
 
@@ -783,21 +853,39 @@ def render_tab_proactivos(metas: dict):
 # FUNCIÓN PRINCIPAL
 # ============================================================================
 
+# HTML estático del header y footer (constantes: no se reconstruyen en cada rerun)
+_APP_HEADER_HTML = """
+<div class="app-header">
+    <svg class="ico app-header-icon"><use href="#mdi-shield-lock"/></svg>
+    <div class="app-header-title">
+        <h1>Dashboard SSO</h1>
+        <div class="app-header-subtitle">
+            Sistema de Gestión de Seguridad y Salud Ocupacional | IESS CD 513
+        </div>
+    </div>
+</div>
+"""
+
+# Sin SVG: se inserta con st.html, que omite el parser de markdown
+_APP_FOOTER_HTML = """
+<div style='text-align: center; color: #888; font-size: 0.8rem; margin-top: 20px;'>
+    <div style="display: flex; justify-content: center; gap: 10px; align-items: center;">
+        <span>Dashboard SSO v2.0 Professional</span>
+        <span>•</span>
+        <span>Normativa IESS CD 513</span>
+    </div>
+    <div style="margin-top: 5px;">
+         © 2024 - Arquitectura de Software Modular
+    </div>
+</div>
+"""
+
+
 def main():
     """Función principal de la aplicación"""
     
-    # Header profesional con Iconify
-    st.markdown("""
-    <div class="app-header">
-        <iconify-icon icon="mdi:shield-lock" class="app-header-icon"></iconify-icon>
-        <div class="app-header-title">
-            <h1>Dashboard SSO</h1>
-            <div class="app-header-subtitle">
-                Sistema de Gestión de Seguridad y Salud Ocupacional | IESS CD 513
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    # Header profesional con icono del sprite SVG (st.html eliminaría el <svg>, se mantiene markdown)
+    st.markdown(_APP_HEADER_HTML, unsafe_allow_html=True)
     
     # Renderizar sidebar y obtener configuración
     config = render_sidebar()
@@ -809,6 +897,9 @@ def main():
         ANUAL=config['k_anual']
     )
     
+    # Fecha de los nombres de archivo descargables (una vez por ejecución)
+    fecha_str = datetime.now().strftime('%Y%m%d')
+    
     # Tabs principales con iconos
     tab_reactivos, tab_proactivos = st.tabs([
         "Indicadores Reactivos",
@@ -816,25 +907,14 @@ def main():
     ])
     
     with tab_reactivos:
-        render_tab_reactivos(constantes_k)
+        render_tab_reactivos(constantes_k, fecha_str)
     
     with tab_proactivos:
-        render_tab_proactivos(config['metas'])
+        render_tab_proactivos(config['metas'], fecha_str)
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style='text-align: center; color: #888; font-size: 0.8rem; margin-top: 20px;'>
-        <div style="display: flex; justify-content: center; gap: 10px; align-items: center;">
-            <span>Dashboard SSO v2.0 Professional</span>
-            <span>•</span>
-            <span>Normativa IESS CD 513</span>
-        </div>
-        <div style="margin-top: 5px;">
-             © 2024 - Arquitectura de Software Modular
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(_APP_FOOTER_HTML)
 
 
 # ============================================================================
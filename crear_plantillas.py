@@ -4,10 +4,10 @@ Script para generar las plantillas Excel de carga masiva
 Ejecutar una vez para crear los archivos de plantilla
 """
 
-import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.utils import get_column_letter
 import os
 
 # Meses en español
@@ -24,41 +24,39 @@ BORDER = Border(
     bottom=Side(style='thin')
 )
 
-def aplicar_estilos_hoja(ws, num_columnas):
-    """Aplica estilos a la hoja"""
-    # Estilos de header
-    for col in range(1, num_columnas + 1):
-        cell = ws.cell(row=1, column=col)
+CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+
+
+def celda(ws, valor, encabezado=False):
+    """Crea una celda de escritura secuencial con los estilos de la plantilla"""
+    cell = WriteOnlyCell(ws, value=valor)
+    cell.border = BORDER
+    cell.alignment = CENTER_ALIGN
+    if encabezado:
         cell.fill = HEADER_FILL
         cell.font = HEADER_FONT
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = BORDER
+    return cell
+
+
+def escribir_hoja(ws, headers):
+    """Escribe headers y 12 meses con valores en 0, fila a fila (modo write-only)"""
+    # Ancho de columnas: se calcula de los textos conocidos (headers y meses)
+    for col, header in enumerate(headers, 1):
+        textos = [header] + (MESES if col == 1 else [])
+        max_length = max(len(texto) for texto in textos)
+        ws.column_dimensions[get_column_letter(col)].width = max(12, max_length + 2)
     
-    # Estilos de datos
-    for row in range(2, 14):  # 12 meses
-        for col in range(1, num_columnas + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.border = BORDER
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+    ws.append([celda(ws, header, encabezado=True) for header in headers])
     
-    # Ancho de columnas
-    for col in ws.columns:
-        max_length = 0
-        column = col[0].column_letter
-        for cell in col:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        ws.column_dimensions[column].width = max(12, max_length + 2)
+    # Meses con valores por defecto
+    for mes in MESES:
+        ws.append([celda(ws, mes)] + [celda(ws, 0) for _ in headers[1:]])
 
 
 def crear_plantilla_reactivos():
     """Crea plantilla para indicadores reactivos"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Reactivos"
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title="Reactivos")
     
     # Headers - solo campos de ENTRADA (no calculados)
     headers = [
@@ -72,16 +70,7 @@ def crear_plantilla_reactivos():
         'dias_perdidos'     # Total Días Perdidos
     ]
     
-    for col, header in enumerate(headers, 1):
-        ws.cell(row=1, column=col, value=header)
-    
-    # Meses con valores por defecto
-    for row, mes in enumerate(MESES, 2):
-        ws.cell(row=row, column=1, value=mes)
-        for col in range(2, len(headers) + 1):
-            ws.cell(row=row, column=col, value=0)
-    
-    aplicar_estilos_hoja(ws, len(headers))
+    escribir_hoja(ws, headers)
     
     # Guardar
     wb.save('templates/plantilla_reactivos.xlsx')
@@ -90,10 +79,7 @@ def crear_plantilla_reactivos():
 
 def crear_plantilla_proactivos():
     """Crea plantilla para indicadores proactivos (7 hojas)"""
-    wb = Workbook()
-    
-    # Eliminar hoja por defecto
-    wb.remove(wb.active)
+    wb = Workbook(write_only=True)
     
     # Definir estructura de cada indicador
     indicadores = {
@@ -109,18 +95,7 @@ def crear_plantilla_proactivos():
     
     for nombre_hoja, columnas in indicadores.items():
         ws = wb.create_sheet(title=nombre_hoja)
-        
-        # Headers
-        for col, header in enumerate(columnas, 1):
-            ws.cell(row=1, column=col, value=header)
-        
-        # Meses y valores por defecto
-        for row, mes in enumerate(MESES, 2):
-            ws.cell(row=row, column=1, value=mes)
-            for col in range(2, len(columnas) + 1):
-                ws.cell(row=row, column=col, value=0)
-        
-        aplicar_estilos_hoja(ws, len(columnas))
+        escribir_hoja(ws, columnas)
     
     # Guardar
     wb.save('templates/plantilla_proactivos.xlsx')
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Script para descargar los recursos estáticos locales (fuente Inter y sprite de iconos)
+Opcional: la fuente no va en el repositorio; sin ejecutarlo la app usa Google Fonts
+"""
+
+import os
+import json
+import urllib.request
+
+# Recursos a autoalojar: destino -> URL de origen
+RECURSOS = {
+    'static/fonts/InterVariable.woff2': 'https://rsms.me/inter/font-files/InterVariable.woff2',
+}
+
+# Iconos usados en app.py, agrupados por colección de Iconify
+ICONOS = {
+    'lucide': [
+        'download', 'upload-cloud', 'info', 'target', 'check-circle', 'alert-triangle',
+        'table-2', 'line-chart', 'shield-check', 'layers', 'clipboard-check',
+    ],
+    'mdi': ['shield-check-outline', 'shield-lock'],
+    'tabler': ['math-function'],
+}
+
+SPRITE_DESTINO = 'static/iconos.svg'
+ICONIFY_API = 'https://api.iconify.design'
+
+
+def descargar_recurso(destino, url):
+    """Descarga un recurso si aún no existe en disco"""
+    if os.path.exists(destino):
+        print(f"• {destino} ya existe")
+        return
+    
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    urllib.request.urlretrieve(url, destino)
+    print(f"✓ {destino} descargado")
+
+
+def generar_sprite_iconos(destino=SPRITE_DESTINO):
+    """Genera un sprite SVG con un <symbol> por icono (id: prefijo-nombre)"""
+    simbolos = []
+    
+    for prefijo, nombres in ICONOS.items():
+        url = f"{ICONIFY_API}/{prefijo}.json?icons={','.join(nombres)}"
+        with urllib.request.urlopen(url) as respuesta:
+            coleccion = json.load(respuesta)
+        
+        iconos = coleccion.get('icons', {})
+        alias = coleccion.get('aliases', {})
+        
+        for nombre in nombres:
+            # Los nombres antiguos (p.ej. upload-cloud) llegan como alias del icono actual
+            real = alias.get(nombre, {}).get('parent', nombre)
+            icono = iconos[real]
+            ancho = icono.get('width', coleccion.get('width', 24))
+            alto = icono.get('height', coleccion.get('height', 24))
+            simbolos.append(
+                f'<symbol id="{prefijo}-{nombre}" viewBox="0 0 {ancho} {alto}">{icono["body"]}</symbol>'
+            )
+    
+    sprite = (
+        '<svg xmlns="http://www.w3.org/2000/svg" style="display:none">\n'
+        + '\n'.join(simbolos)
+        + '\n</svg>\n'
+    )
+    
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    with open(destino, 'w', encoding='utf-8') as f:
+        f.write(sprite)
+    print(f"✓ {destino} generado ({len(simbolos)} iconos)")
+
+
+if __name__ == "__main__":
+    for destino, url in RECURSOS.items():
+        descargar_recurso(destino, url)
+    generar_sprite_iconos()
+    print("\n¡Recursos estáticos listos!")
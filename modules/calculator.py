@@ -6,9 +6,22 @@ Este módulo implementa las 11 fórmulas de indicadores de Seguridad
 y Salud Ocupacional requeridas por la normativa ecuatoriana.
 """
 
+import math
 import pandas as pd
 import numpy as np
-from typing import Union
+from typing import List, Union
+
+
+# pandas < 3 copia el frame completo en concat salvo copy=False; desde 3.0 (Copy-on-Write)
+# la copia ya es diferida y la palabra clave está obsoleta
+_CONCAT_SIN_COPIA = {'copy': False} if int(pd.__version__.split('.')[0]) < 3 else {}
+
+
+def _anexar_columnas(df: pd.DataFrame, nuevas: pd.DataFrame) -> pd.DataFrame:
+    """Anexa columnas calculadas a df sin copiar sus columnas originales (reemplaza las homónimas)"""
+    repetidas = nuevas.columns.intersection(df.columns)
+    base = df.drop(columns=repetidas) if len(repetidas) else df
+    return pd.concat([base, nuevas], axis=1, **_CONCAT_SIN_COPIA)
 
 
 class SSOCalculator:
@@ -46,6 +59,26 @@ class SSOCalculator:
     }
     SUMA_PESOS = sum(PESOS.values())  # 22
     
+    # Columnas de entrada que usan las fórmulas
+    COLUMNAS_ENTRADA = [
+        'accidentes', 'horas_trabajadas', 'dias_perdidos',
+        'nart_ejec', 'nart_prog',
+        'opas_real', 'opas_personas_conf', 'opas_prog', 'opas_personas_prev',
+        'dps_real', 'dps_asistentes', 'dps_plan', 'dps_previstos',
+        'ds_eliminadas', 'ds_detectadas',
+        'ent_entrenados', 'ent_programados',
+        'osea_cumplidos', 'osea_aplicables',
+        'cai_implement', 'cai_propuestas',
+        'ef_auditados', 'ef_totales',
+    ]
+    
+    # Columnas calculadas, en el orden de las filas de _calcular_bloque
+    COLUMNAS_INDICADORES = ['IF', 'IG', 'IART', 'OPAS', 'IDPS', 'IDS',
+                            'IENTS', 'IOSEA', 'ICAI', 'IEF', 'IG_TOTAL']
+    
+    # Filas por bloque: entradas y salidas de un bloque caben juntas en la caché L2
+    BLOQUE_FILAS = 16_384
+    
     @staticmethod
     def _safe_divide(numerador: float, denominador: float) -> float:
         """
@@ -58,11 +91,13 @@ class SSOCalculator:
         Returns:
             float: Resultado de la división o 0 si hay error
         """
+        # Sin llamadas a pandas/NumPy por valor: un NaN en el denominador da un
+        # resultado no finito y los tipos no numéricos (None, pd.NA, str) caen en el except
         try:
-            if denominador == 0 or pd.isna(denominador):
+            if denominador == 0:
                 return 0.0
             resultado = numerador / denominador
-            return 0.0 if pd.isna(resultado) or np.isinf(resultado) else resultado
+            return resultado if math.isfinite(resultado) else 0.0
         except (ZeroDivisionError, TypeError, ValueError):
             return 0.0
     
@@ -309,114 +344,158 @@ class SSOCalculator:
         except (TypeError, ValueError):
             return 0.0
     
+    @staticmethod
+    def _safe_divide_array(numerador: np.ndarray, denominador: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de _safe_divide para columnas completas.
+        
+        Args:
+            numerador: Array de numeradores
+            denominador: Array de denominadores
+            
+        Returns:
+            np.ndarray: Resultado elemento a elemento (float32 si ambas entradas lo son,
+            float64 en otro caso); 0 donde el denominador es 0/NaN o el resultado no es finito
+        """
+        tipo = np.result_type(numerador, denominador, np.float32)
+        validos = (denominador != 0) & ~np.isnan(denominador)
+        
+        if validos.all():
+            # Caso habitual (sin ceros ni NaN en el denominador): división directa,
+            # sin arreglo de ceros previo ni máscara
+            resultado = np.divide(numerador, denominador, dtype=tipo)
+        else:
+            resultado = np.zeros(np.broadcast(numerador, denominador).shape, dtype=tipo)
+            np.divide(numerador, denominador, out=resultado, where=validos)
+        
+        resultado[~np.isfinite(resultado)] = 0.0
+        return resultado
+    
     @classmethod
-    def procesar_dataframe(cls, df: pd.DataFrame) -> pd.DataFrame:
+    def _calcular_bloque(cls, v: dict, pesos: np.ndarray) -> np.ndarray:
+        """
+        Evalúa las 11 fórmulas sobre un bloque de filas.
+        
+        Args:
+            v: Columnas de entrada del bloque ({nombre: np.ndarray})
+            pesos: Pesos de IG_TOTAL en el orden de PESOS, con el tipo de los cálculos
+            
+        Returns:
+            np.ndarray: Matriz (11, filas) en el orden de COLUMNAS_INDICADORES
+        """
+        # IF e IG comparten denominador: FACTOR_HHT / horas se divide una sola vez
+        factor_horas = cls._safe_divide_array(cls.FACTOR_HHT, v['horas_trabajadas'])
+        reactivos = np.vstack([v['accidentes'], v['dias_perdidos']]) * factor_horas
+        reactivos[~np.isfinite(reactivos)] = 0.0
+        
+        # Numeradores y denominadores proactivos apilados (una fila por indicador, en el
+        # orden de COLUMNAS_INDICADORES) para resolver las 8 divisiones en una sola operación
+        numeradores = np.vstack([
+            v['nart_ejec'],
+            v['opas_real'] * v['opas_personas_conf'],
+            v['dps_real'] * v['dps_asistentes'],
+            v['ds_eliminadas'],
+            v['ent_entrenados'],
+            v['osea_cumplidos'],
+            v['cai_implement'],
+            v['ef_auditados'],
+        ])
+        denominadores = np.vstack([
+            v['nart_prog'],
+            v['opas_prog'] * v['opas_personas_prev'],
+            v['dps_plan'] * v['dps_previstos'],
+            v['ds_detectadas'],
+            v['ent_programados'],
+            v['osea_aplicables'],
+            v['cai_propuestas'],
+            v['ef_totales'],
+        ])
+        proactivos = cls._safe_divide_array(numeradores, denominadores) * 100
+        
+        # IG_TOTAL: suma ponderada como producto matriz-vector (BLAS). Las filas proactivas
+        # siguen el orden de PESOS, así que las ponderadas son una vista contigua (sin copiar filas)
+        ig_total = pesos @ proactivos[:len(pesos)] / cls.SUMA_PESOS
+        
+        return np.vstack([reactivos, proactivos, ig_total])
+    
+    @classmethod
+    def procesar_dataframe(cls, df: pd.DataFrame, dtype: type = np.float32) -> pd.DataFrame:
         """
         Procesa un DataFrame completo calculando todos los indicadores.
         
         Añade columnas calculadas para cada uno de los 11 indicadores
-        y una columna de estado de cumplimiento.
+        y una columna de estado de cumplimiento. Las fórmulas se evalúan
+        sobre columnas completas (NumPy); una columna ausente vale 0 y los
+        valores no numéricos se tratan como NaN (resultado 0).
         
         Args:
             df: DataFrame con los datos crudos de entrada
+            dtype: Tipo de las columnas calculadas; float32 por defecto (ratios y
+                porcentajes no necesitan 64 bits), np.float64 si se requiere
             
         Returns:
-            pd.DataFrame: DataFrame con todas las columnas calculadas
+            pd.DataFrame: Nuevo DataFrame con todas las columnas calculadas; las
+            columnas de entrada no se copian (df no se modifica)
         """
-        df = df.copy()
-        
-        # Calcular IF e IG (indicadores reactivos)
-        df['IF'] = df.apply(
-            lambda row: cls.calcular_if(
-                row.get('accidentes', 0),
-                row.get('horas_trabajadas', 0)
-            ), axis=1
-        )
-        
-        df['IG'] = df.apply(
-            lambda row: cls.calcular_ig(
-                row.get('dias_perdidos', 0),
-                row.get('horas_trabajadas', 0)
-            ), axis=1
-        )
-        
-        # Calcular IART
-        df['IART'] = df.apply(
-            lambda row: cls.calcular_iart(
-                row.get('nart_ejec', 0),
-                row.get('nart_prog', 0)
-            ), axis=1
-        )
-        
-        # Calcular OPAS
-        df['OPAS'] = df.apply(
-            lambda row: cls.calcular_opas(
-                row.get('opas_real', 0),
-                row.get('opas_personas_conf', 0),
-                row.get('opas_prog', 0),
-                row.get('opas_personas_prev', 0)
-            ), axis=1
-        )
-        
-        # Calcular IDPS
-        df['IDPS'] = df.apply(
-            lambda row: cls.calcular_idps(
-                row.get('dps_real', 0),
-                row.get('dps_asistentes', 0),
-                row.get('dps_plan', 0),
-                row.get('dps_previstos', 0)
-            ), axis=1
-        )
-        
-        # Calcular IDS
-        df['IDS'] = df.apply(
-            lambda row: cls.calcular_ids(
-                row.get('ds_eliminadas', 0),
-                row.get('ds_detectadas', 0)
-            ), axis=1
-        )
-        
-        # Calcular IENTS
-        df['IENTS'] = df.apply(
-            lambda row: cls.calcular_ients(
-                row.get('ent_entrenados', 0),
-                row.get('ent_programados', 0)
-            ), axis=1
-        )
+        def col(nombre: str) -> np.ndarray:
+            if nombre not in df.columns:
+                return np.zeros(len(df), dtype=dtype)
+            serie = df[nombre]
+            if not pd.api.types.is_numeric_dtype(serie):
+                serie = pd.to_numeric(serie, errors='coerce')
+            return serie.to_numpy(dtype=dtype, na_value=np.nan)
+        
+        entradas = {nombre: col(nombre) for nombre in cls.COLUMNAS_ENTRADA}
+        n = len(df)
+        
+        # Pesos de IG_TOTAL como vector, construido una vez por llamada (no por bloque)
+        pesos = np.array(list(cls.PESOS.values()), dtype=dtype)
+        
+        # Se recorre por bloques de filas para que todas las fórmulas de un bloque trabajen
+        # sobre datos en caché, en vez de una pasada completa por columna
+        matriz = np.empty((len(cls.COLUMNAS_INDICADORES), n), dtype=dtype)
+        for inicio in range(0, n, cls.BLOQUE_FILAS):
+            bloque = slice(inicio, inicio + cls.BLOQUE_FILAS)
+            matriz[:, bloque] = cls._calcular_bloque(
+                {nombre: valores[bloque] for nombre, valores in entradas.items()}, pesos
+            )
         
-        # Calcular IOSEA
-        df['IOSEA'] = df.apply(
-            lambda row: cls.calcular_iosea(
-                row.get('osea_cumplidos', 0),
-                row.get('osea_aplicables', 0)
-            ), axis=1
-        )
+        # Los 11 resultados se anexan como un único bloque del tipo pedido (una inserción, no once);
+        # la matriz es propia de esta llamada, así que el bloque la usa sin copiarla
+        resultados = pd.DataFrame(matriz.T, index=df.index, columns=cls.COLUMNAS_INDICADORES, copy=False)
+        return _anexar_columnas(df, resultados)
+    
+    @classmethod
+    def procesar_lote(cls, dfs: List[pd.DataFrame], dtype: type = np.float32) -> List[pd.DataFrame]:
+        """
+        Procesa varios DataFrames (p.ej. un archivo o grupo cada uno) en una sola pasada.
         
-        # Calcular ICAI
-        df['ICAI'] = df.apply(
-            lambda row: cls.calcular_icai(
-                row.get('cai_implement', 0),
-                row.get('cai_propuestas', 0)
-            ), axis=1
-        )
+        Apila solo las columnas de entrada de todos los DataFrames, calcula los
+        indicadores una vez y devuelve a cada uno su tramo de resultados, de modo
+        que el costo fijo de procesar_dataframe se paga una sola vez.
         
-        # Calcular IEF
-        df['IEF'] = df.apply(
-            lambda row: cls.calcular_ief(
-                row.get('ef_auditados', 0),
-                row.get('ef_totales', 0)
-            ), axis=1
-        )
+        Args:
+            dfs: Lista de DataFrames con los datos crudos de entrada
+            dtype: Tipo de las columnas calculadas (ver procesar_dataframe)
+            
+        Returns:
+            List[pd.DataFrame]: Un DataFrame por entrada, igual al que retornaría
+            procesar_dataframe para ese DataFrame
+        """
+        if not dfs:
+            return []
         
-        # Calcular IG_TOTAL
-        df['IG_TOTAL'] = df.apply(
-            lambda row: cls.calcular_ig_total(
-                row['IART'], row['OPAS'], row['IDPS'],
-                row['IDS'], row['IENTS'], row['IOSEA'], row['ICAI']
-            ), axis=1
+        apilado = pd.concat(
+            [df[df.columns.intersection(cls.COLUMNAS_ENTRADA)] for df in dfs],
+            ignore_index=True
         )
+        indicadores = cls.procesar_dataframe(apilado, dtype=dtype)[cls.COLUMNAS_INDICADORES]
         
-        return df
+        limites = np.cumsum([0] + [len(df) for df in dfs])
+        return [
+            _anexar_columnas(df, indicadores.iloc[inicio:fin].set_axis(df.index))
+            for df, inicio, fin in zip(dfs, limites[:-1], limites[1:])
+        ]
     
     @staticmethod
     def evaluar_cumplimiento(valor: float, meta: float = 80.0) -> str:
@@ -436,17 +515,32 @@ class SSOCalculator:
     def agregar_estado_cumplimiento(cls, df: pd.DataFrame, 
                                      meta: float = 80.0) -> pd.DataFrame:
         """
-        Agrega columna de estado de cumplimiento basado en IG_TOTAL.
+        Agrega columna booleana de cumplimiento basada en IG_TOTAL.
+        
+        La columna 'Cumple' ocupa 1 byte por fila; la etiqueta 'CUMPLE'/'NO CUMPLE'
+        se genera solo al presentar los datos con etiquetar_cumplimiento.
         
         Args:
             df: DataFrame con indicadores calculados
             meta: Meta de cumplimiento (default 80%)
             
         Returns:
-            pd.DataFrame: DataFrame con columna 'Estado' añadida
+            pd.DataFrame: Nuevo DataFrame con columna 'Cumple' (bool) añadida; las
+            columnas de entrada no se copian (df no se modifica)
         """
-        df = df.copy()
-        df['Estado'] = df['IG_TOTAL'].apply(
-            lambda x: cls.evaluar_cumplimiento(x, meta)
-        )
-        return df
+        # Misma regla que evaluar_cumplimiento, aplicada a toda la columna
+        cumple = df['IG_TOTAL'].to_numpy(dtype=np.float64) >= meta
+        return _anexar_columnas(df, pd.DataFrame({'Cumple': cumple}, index=df.index))
+    
+    @staticmethod
+    def etiquetar_cumplimiento(cumple: pd.Series) -> pd.Series:
+        """
+        Convierte la columna booleana 'Cumple' en etiquetas para presentación.
+        
+        Args:
+            cumple: Serie booleana de cumplimiento
+            
+        Returns:
+            pd.Series: 'CUMPLE' o 'NO CUMPLE' por fila
+        """
+        return cumple.map({True: 'CUMPLE', False: 'NO CUMPLE'})
@@ -9,9 +9,30 @@ carga de archivos, generación de datos de prueba y exportación.
 import pandas as pd
 import numpy as np
 from io import BytesIO
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Iterable, Union
 from datetime import datetime
-import random
+
+
+# Con Copy-on-Write (siempre activo desde pandas 3.0) una copia superficial ya aísla
+# al DataFrame original: los datos solo se duplican al modificar una columna
+_COPY_ON_WRITE = (int(pd.__version__.split('.')[0]) >= 3
+                  or pd.get_option('mode.copy_on_write') is True)
+
+
+def leer_excel(archivo, **kwargs):
+    """
+    Lee un Excel con el motor calamine (Rust, sin árbol DOM).
+    
+    Recurre al motor por defecto de pandas solo si python-calamine no está
+    instalado (ImportError) o no admite la entrada (ValueError); un libro dañado
+    propaga el error de calamine en lugar de leerse dos veces.
+    """
+    try:
+        return pd.read_excel(archivo, engine='calamine', **kwargs)
+    except (ImportError, ValueError):
+        if hasattr(archivo, 'seek'):
+            archivo.seek(0)
+        return pd.read_excel(archivo, **kwargs)
 
 
 class DataManager:
@@ -24,6 +45,7 @@ class DataManager:
     Attributes:
         MESES: Lista de meses en español
         COLUMNAS_BASE: Columnas requeridas para el sistema
+        DESCRIPCION_COLUMNAS: Descripción de cada columna base
     """
     
     MESES = [
@@ -43,6 +65,50 @@ class DataManager:
         'ef_totales', 'ef_auditados',
     ]
     
+    # Descripción de cada columna de COLUMNAS_BASE (hoja "Instrucciones" de la plantilla)
+    DESCRIPCION_COLUMNAS = {
+        'mes': 'Nombre del mes (enero a diciembre)',
+        'anio': 'Año del registro',
+        'horas_trabajadas': 'Horas hombre trabajadas en el mes',
+        'accidentes': 'Número de accidentes con lesión',
+        'dias_perdidos': 'Días perdidos por incapacidad',
+        'nart_prog': 'Análisis de riesgos de tareas programados',
+        'nart_ejec': 'Análisis de riesgos de tareas ejecutados',
+        'opas_prog': 'Observaciones planeadas programadas',
+        'opas_real': 'Observaciones planeadas realizadas',
+        'opas_personas_prev': 'Personas previstas en las observaciones',
+        'opas_personas_conf': 'Personas observadas que cumplen el estándar',
+        'dps_plan': 'Diálogos periódicos de seguridad planificados',
+        'dps_real': 'Diálogos periódicos de seguridad realizados',
+        'dps_previstos': 'Asistentes previstos a los diálogos',
+        'dps_asistentes': 'Asistentes a los diálogos',
+        'ds_detectadas': 'Demandas de seguridad detectadas',
+        'ds_eliminadas': 'Demandas de seguridad eliminadas',
+        'ent_programados': 'Trabajadores programados para entrenamiento',
+        'ent_entrenados': 'Trabajadores entrenados',
+        'osea_aplicables': 'Órdenes de servicio estandarizadas aplicables',
+        'osea_cumplidos': 'Órdenes de servicio estandarizadas cumplidas',
+        'cai_propuestas': 'Medidas de control de accidentes e incidentes propuestas',
+        'cai_implement': 'Medidas de control de accidentes e incidentes implementadas',
+        'ef_totales': 'Elementos a evaluar para la eficacia del sistema',
+        'ef_auditados': 'Elementos auditados con resultado eficaz',
+    }
+    
+    # Valor mínimo de cada denominador en los datos dummy
+    _MINIMOS_DENOMINADOR = {
+        'horas_trabajadas': 1000,
+        'nart_prog': 1, 'opas_prog': 1, 'opas_personas_prev': 1,
+        'dps_plan': 1, 'dps_previstos': 1, 'ds_detectadas': 1,
+        'ent_programados': 1, 'osea_aplicables': 1, 'cai_propuestas': 1,
+        'ef_totales': 1,
+    }
+    
+    # Plantillas Excel ya serializadas, por (columnas, año)
+    _plantillas: Dict[tuple, bytes] = {}
+    
+    # Hoja de instrucciones de la plantilla, construida en el primer uso
+    _instrucciones: Optional[pd.DataFrame] = None
+    
     def __init__(self, anio: int = None):
         """
         Inicializa el gestor de datos.
@@ -52,6 +118,17 @@ class DataManager:
         """
         self.anio = anio or datetime.now().year
         self.df = None
+        # Generador propio (PCG64): no comparte estado con el RNG global
+        self._rng = np.random.default_rng()
+    
+    def establecer_semilla(self, semilla: int = None) -> None:
+        """
+        Reinicia el generador aleatorio de la instancia.
+        
+        Args:
+            semilla: Semilla para reproducibilidad (None: entropía del sistema)
+        """
+        self._rng = np.random.default_rng(semilla)
     
     def cargar_excel(self, archivo) -> pd.DataFrame:
         """
@@ -67,122 +144,131 @@ class DataManager:
             ValueError: Si hay error en la carga
         """
         try:
-            df = pd.read_excel(archivo)
+            # Motor calamine (Rust, sin árbol DOM); motor por defecto si no está disponible
+            df = leer_excel(archivo)
             # Normalizar nombres de columnas
-            df.columns = [col.lower().strip() for col in df.columns]
-            self.df = df
+            df.columns = df.columns.astype(str).str.lower().str.strip()
+            self.df = self._categorizar_mes(df)
             return df
         except Exception as e:
             raise ValueError(f"Error al cargar archivo Excel: {str(e)}")
     
-    def generar_datos_dummy(self, anio: int = None, 
+    def generar_datos_dummy(self, anio: Union[int, Iterable[int]] = None, 
                             semilla: int = None) -> pd.DataFrame:
         """
         Genera un DataFrame con datos aleatorios coherentes.
         
         Los datos generados son realistas y evitan denominadores
-        en cero para todos los cálculos.
+        en cero para todos los cálculos. Con varios años, todos los
+        meses se generan en una sola pasada vectorizada.
         
         Args:
-            anio: Año para los datos (default: año de la instancia)
-            semilla: Semilla para reproducibilidad (opcional)
+            anio: Año o lista de años para los datos (default: año de la instancia)
+            semilla: Semilla para reproducibilidad (opcional); sin ella se
+                continúa la secuencia del generador de la instancia
             
         Returns:
-            pd.DataFrame: DataFrame con datos de prueba para 12 meses
+            pd.DataFrame: DataFrame con datos de prueba, 12 meses por año
         """
         if semilla is not None:
-            random.seed(semilla)
-            np.random.seed(semilla)
-        
-        anio = anio or self.anio
+            self.establecer_semilla(semilla)
+        rng = self._rng
+        anios = [anio or self.anio] if anio is None or np.isscalar(anio) else list(anio)
+        n = len(self.MESES) * len(anios)
+        
+        # Todos los conteos caben en int32: columnas tipadas desde su creación
+        def enteros(bajo: int, alto: int) -> np.ndarray:
+            # Enteros uniformes en [bajo, alto], ambos incluidos
+            return rng.integers(bajo, alto + 1, size=n, dtype=np.int32)
+        
+        def fraccion(total: np.ndarray, bajo: float, alto: float) -> np.ndarray:
+            # Porcentaje aleatorio de un total, truncado a entero
+            return np.floor(total * rng.uniform(bajo, alto, size=n)).astype(np.int32)
+        
+        # Datos base
+        trabajadores = enteros(80, 150)
+        dias_laborables = enteros(20, 23)
+        horas_dia = 8
+        horas_trabajadas = trabajadores * dias_laborables * horas_dia
+        
+        # Accidentes y días perdidos (bajos para empresa con buen SSO)
+        accidentes = rng.choice(np.array([0, 1, 2], dtype=np.int32), size=n,
+                                p=[0.7, 0.25, 0.05])
+        dias_perdidos = accidentes * enteros(1, 5)
+        
+        # IART - Análisis de Riesgos de Tarea
+        nart_prog = enteros(8, 15)
+        # Ejecutados suelen ser alto porcentaje de programados
+        nart_ejec = fraccion(nart_prog, 0.75, 1.0)
+        
+        # OPAS - Observaciones Planeadas
+        opas_prog = enteros(10, 20)
+        opas_real = fraccion(opas_prog, 0.70, 1.0)
+        opas_personas_prev = enteros(30, 50)
+        # Personas conformes como porcentaje de previstas ajustado
+        opas_personas_conf = fraccion(opas_personas_prev, 0.75, 0.95)
+        
+        # IDPS - Diálogos Periódicos de Seguridad
+        dps_plan = enteros(4, 8)
+        dps_real = fraccion(dps_plan, 0.75, 1.0)
+        dps_previstos = enteros(20, 40)
+        dps_asistentes = fraccion(dps_previstos, 0.80, 1.0)
+        
+        # IDS - Demanda de Seguridad
+        ds_detectadas = enteros(5, 15)
+        # Eliminadas como porcentaje de detectadas
+        ds_eliminadas = fraccion(ds_detectadas, 0.70, 0.95)
+        
+        # IENTS - Entrenamiento
+        ent_programados = enteros(15, 30)
+        ent_entrenados = fraccion(ent_programados, 0.75, 1.0)
+        
+        # IOSEA - Órdenes de Servicio
+        osea_aplicables = enteros(10, 20)
+        osea_cumplidos = fraccion(osea_aplicables, 0.75, 0.98)
+        
+        # ICAI - Control de Accidentes/Incidentes
+        cai_propuestas = enteros(3, 8)
+        cai_implement = fraccion(cai_propuestas, 0.70, 1.0)
+        
+        # IEF - Eficacia
+        ef_totales = enteros(15, 25)
+        ef_auditados = fraccion(ef_totales, 0.75, 0.95)
+        
+        columnas = {
+            'mes': pd.Categorical(self.MESES * len(anios), categories=self.MESES,
+                                  ordered=True),
+            'anio': np.repeat(np.asarray(anios, dtype=np.int32), len(self.MESES)),
+            'horas_trabajadas': horas_trabajadas,
+            'accidentes': accidentes,
+            'dias_perdidos': dias_perdidos,
+            'nart_prog': nart_prog,
+            'nart_ejec': nart_ejec,
+            'opas_prog': opas_prog,
+            'opas_real': opas_real,
+            'opas_personas_prev': opas_personas_prev,
+            'opas_personas_conf': opas_personas_conf,
+            'dps_plan': dps_plan,
+            'dps_real': dps_real,
+            'dps_previstos': dps_previstos,
+            'dps_asistentes': dps_asistentes,
+            'ds_detectadas': ds_detectadas,
+            'ds_eliminadas': ds_eliminadas,
+            'ent_programados': ent_programados,
+            'ent_entrenados': ent_entrenados,
+            'osea_aplicables': osea_aplicables,
+            'osea_cumplidos': osea_cumplidos,
+            'cai_propuestas': cai_propuestas,
+            'cai_implement': cai_implement,
+            'ef_totales': ef_totales,
+            'ef_auditados': ef_auditados,
+        }
         
-        datos = []
+        # Asegurar que ningún denominador sea cero
+        for columna, minimo in self._MINIMOS_DENOMINADOR.items():
+            columnas[columna] = np.maximum(columnas[columna], minimo)
         
-        for i, mes in enumerate(self.MESES):
-            # Variación estacional (más actividad en algunos meses)
-            factor_estacional = 1 + 0.1 * np.sin(i * np.pi / 6)
-            
-            # Datos base
-            trabajadores = random.randint(80, 150)
-            dias_laborables = random.randint(20, 23)
-            horas_dia = 8
-            horas_trabajadas = trabajadores * dias_laborables * horas_dia
-            
-            # Accidentes y días perdidos (bajos para empresa con buen SSO)
-            accidentes = random.choices([0, 1, 2], weights=[0.7, 0.25, 0.05])[0]
-            dias_perdidos = accidentes * random.randint(1, 5) if accidentes > 0 else 0
-            
-            # IART - Análisis de Riesgos de Tarea
-            nart_prog = random.randint(8, 15)
-            # Ejecutados suelen ser alto porcentaje de programados
-            nart_ejec = int(nart_prog * random.uniform(0.75, 1.0))
-            
-            # OPAS - Observaciones Planeadas
-            opas_prog = random.randint(10, 20)
-            opas_real = int(opas_prog * random.uniform(0.70, 1.0))
-            opas_personas_prev = random.randint(30, 50)
-            # Personas conformes como porcentaje de previstas ajustado
-            opas_personas_conf = int(opas_personas_prev * random.uniform(0.75, 0.95))
-            
-            # IDPS - Diálogos Periódicos de Seguridad
-            dps_plan = random.randint(4, 8)
-            dps_real = int(dps_plan * random.uniform(0.75, 1.0))
-            dps_previstos = random.randint(20, 40)
-            dps_asistentes = int(dps_previstos * random.uniform(0.80, 1.0))
-            
-            # IDS - Demanda de Seguridad
-            ds_detectadas = random.randint(5, 15)
-            # Eliminadas como porcentaje de detectadas
-            ds_eliminadas = int(ds_detectadas * random.uniform(0.70, 0.95))
-            
-            # IENTS - Entrenamiento
-            ent_programados = random.randint(15, 30)
-            ent_entrenados = int(ent_programados * random.uniform(0.75, 1.0))
-            
-            # IOSEA - Órdenes de Servicio
-            osea_aplicables = random.randint(10, 20)
-            osea_cumplidos = int(osea_aplicables * random.uniform(0.75, 0.98))
-            
-            # ICAI - Control de Accidentes/Incidentes
-            cai_propuestas = random.randint(3, 8)
-            cai_implement = int(cai_propuestas * random.uniform(0.70, 1.0))
-            
-            # IEF - Eficacia
-            ef_totales = random.randint(15, 25)
-            ef_auditados = int(ef_totales * random.uniform(0.75, 0.95))
-            
-            # Asegurar que ningún denominador sea cero
-            fila = {
-                'mes': mes,
-                'anio': anio,
-                'horas_trabajadas': max(horas_trabajadas, 1000),
-                'accidentes': accidentes,
-                'dias_perdidos': dias_perdidos,
-                'nart_prog': max(nart_prog, 1),
-                'nart_ejec': nart_ejec,
-                'opas_prog': max(opas_prog, 1),
-                'opas_real': opas_real,
-                'opas_personas_prev': max(opas_personas_prev, 1),
-                'opas_personas_conf': opas_personas_conf,
-                'dps_plan': max(dps_plan, 1),
-                'dps_real': dps_real,
-                'dps_previstos': max(dps_previstos, 1),
-                'dps_asistentes': dps_asistentes,
-                'ds_detectadas': max(ds_detectadas, 1),
-                'ds_eliminadas': ds_eliminadas,
-                'ent_programados': max(ent_programados, 1),
-                'ent_entrenados': ent_entrenados,
-                'osea_aplicables': max(osea_aplicables, 1),
-                'osea_cumplidos': osea_cumplidos,
-                'cai_propuestas': max(cai_propuestas, 1),
-                'cai_implement': cai_implement,
-                'ef_totales': max(ef_totales, 1),
-                'ef_auditados': ef_auditados,
-            }
-            
-            datos.append(fila)
-        
-        self.df = pd.DataFrame(datos)
+        self.df = pd.DataFrame(columnas)
         return self.df
     
     def actualizar_mes(self, mes: str, datos: Dict[str, Any]) -> pd.DataFrame:
@@ -204,14 +290,33 @@ class DataManager:
         
         mes_lower = mes.lower().strip()
         
-        if mes_lower not in self.df['mes'].str.lower().values:
+        meses = self.df['mes']
+        
+        if isinstance(meses.dtype, pd.CategoricalDtype):
+            # Comparación sobre los códigos enteros de la categoría
+            codigo = meses.cat.categories.get_indexer([mes_lower])[0]
+            coincidencias = meses.cat.codes == codigo if codigo >= 0 else None
+        else:
+            # Una sola pasada de normalización sirve para validar y ubicar el mes
+            coincidencias = meses.str.lower() == mes_lower
+        
+        if coincidencias is None or not coincidencias.any():
             raise ValueError(f"Mes '{mes}' no encontrado en los datos")
         
-        idx = self.df[self.df['mes'].str.lower() == mes_lower].index[0]
+        idx = coincidencias.idxmax()
+        
+        # Asignación única de todas las columnas conocidas
+        conocidas = set(self.df.columns)
+        valores = {col: datos[col] for col in datos if col in conocidas}
         
-        for columna, valor in datos.items():
-            if columna in self.df.columns:
-                self.df.loc[idx, columna] = valor
+        if 'mes' in valores and isinstance(meses.dtype, pd.CategoricalDtype):
+            # Mismo criterio que _categorizar_mes; un valor que no es categoría se agrega al final
+            valores['mes'] = str(valores['mes']).lower().strip()
+            if valores['mes'] not in meses.cat.categories:
+                self.df['mes'] = meses.cat.add_categories([valores['mes']])
+        
+        if valores:
+            self.df.loc[idx, list(valores)] = list(valores.values())
         
         return self.df
     
@@ -225,26 +330,72 @@ class DataManager:
         Returns:
             pd.DataFrame: DataFrame con el nuevo mes agregado
         """
-        if self.df is None:
-            self.df = pd.DataFrame(columns=self.COLUMNAS_BASE)
+        return self.agregar_meses([datos])
+    
+    def agregar_meses(self, lista_datos: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Agrega varios meses a los datos en una sola operación.
         
-        # Verificar que tenga las columnas mínimas
-        if 'mes' not in datos:
-            raise ValueError("El campo 'mes' es requerido")
+        Construye todas las filas primero y las concatena una única vez,
+        evitando copiar el DataFrame completo por cada mes agregado.
         
-        # Completar con valores por defecto
-        fila_completa = {col: 0 for col in self.COLUMNAS_BASE}
-        fila_completa.update(datos)
+        Args:
+            lista_datos: Lista de diccionarios con los datos de cada mes
+            
+        Returns:
+            pd.DataFrame: DataFrame con los nuevos meses agregados
+        """
+        filas = []
         
-        # Asegurar año
-        if 'anio' not in datos or datos['anio'] is None:
-            fila_completa['anio'] = self.anio
+        for datos in lista_datos:
+            # Verificar que tenga las columnas mínimas
+            if 'mes' not in datos:
+                raise ValueError("El campo 'mes' es requerido")
+            
+            # Completar con valores por defecto
+            fila_completa = {col: 0 for col in self.COLUMNAS_BASE}
+            fila_completa.update(datos)
+            
+            # Asegurar año
+            if 'anio' not in datos or datos['anio'] is None:
+                fila_completa['anio'] = self.anio
+            
+            filas.append(fila_completa)
         
-        self.df = pd.concat([self.df, pd.DataFrame([fila_completa])], 
-                           ignore_index=True)
+        nuevas = pd.DataFrame(filas, columns=self.COLUMNAS_BASE if not filas else None)
+        
+        if self.df is None:
+            self.df = nuevas
+        elif filas:
+            self.df = pd.concat([self.df, nuevas], ignore_index=True)
+        
+        if filas:
+            self._categorizar_mes(self.df)
         
         return self.df
     
+    @classmethod
+    def _categorizar_mes(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convierte la columna 'mes' en un Categorical ordenado por calendario.
+        
+        Los valores se normalizan a minúsculas; los que no son meses
+        conocidos se conservan como categorías adicionales al final.
+        
+        Args:
+            df: DataFrame a modificar en sitio
+            
+        Returns:
+            pd.DataFrame: El mismo DataFrame
+        """
+        if 'mes' not in df.columns:
+            return df
+        
+        meses = df['mes'].astype('string').str.lower().str.strip()
+        extras = [m for m in meses.dropna().unique() if m not in cls.MESES]
+        df['mes'] = pd.Categorical(meses, categories=cls.MESES + extras, ordered=True)
+        return df
+    
     def exportar_excel(self, df: pd.DataFrame = None, 
                        incluir_formulas: bool = True) -> BytesIO:
         """
@@ -262,22 +413,116 @@ class DataManager:
         if df_export is None:
             raise ValueError("No hay datos para exportar")
         
+        # Hoja de metadata: tres filas fijas, se escriben sin pasar por pandas
+        metadata = [
+            ('Campo', 'Valor'),
+            ('Fecha de Exportación', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ('Total Registros', len(df_export)),
+            ('Año', df_export['anio'].iloc[0] if 'anio' in df_export.columns else 'N/A'),
+        ]
+        
         buffer = BytesIO()
         
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            df_export.to_excel(writer, sheet_name='Datos_SSO', index=False)
-            
-            # Agregar hoja de metadata
-            metadata = pd.DataFrame({
-                'Campo': ['Fecha de Exportación', 'Total Registros', 'Año'],
-                'Valor': [
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    len(df_export),
-                    df_export['anio'].iloc[0] if 'anio' in df_export.columns else 'N/A'
-                ]
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        
+        if xlsxwriter is not None:
+            # constant_memory vuelca cada fila al completarse: exige escribir fila a fila
+            # (to_excel escribe por columnas), con memoria constante en tablas grandes.
+            # Mismas convenciones que to_excel: fechas con formato y ±inf como texto
+            wb = xlsxwriter.Workbook(buffer, {
+                'constant_memory': True,
+                'default_date_format': 'yyyy-mm-dd hh:mm:ss',
             })
-            metadata.to_excel(writer, sheet_name='Metadata', index=False)
+            ws = wb.add_worksheet('Datos_SSO')
+            ws.write_row(0, 0, df_export.columns.tolist())
+            valores = (df_export.astype(object)
+                       .where(df_export.notna(), None)
+                       .replace({np.inf: 'inf', -np.inf: '-inf'})
+                       .values.tolist())
+            for fila, registro in enumerate(valores, start=1):
+                ws.write_row(fila, 0, registro)
+            
+            ws = wb.add_worksheet('Metadata')
+            for fila, registro in enumerate(metadata):
+                ws.write_row(fila, 0, registro)
+            wb.close()
+        else:
+            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+                df_export.to_excel(writer, sheet_name='Datos_SSO', index=False)
+                
+                ws = writer.book.create_sheet('Metadata')
+                for registro in metadata:
+                    ws.append(registro)
+        
+        buffer.seek(0)
+        return buffer
+    
+    def _tabla_arrow(self, df: pd.DataFrame = None):
+        """
+        Convierte el DataFrame a una tabla Arrow con la metadata de exportación.
+        
+        La metadata (fecha, registros y año) viaja en el esquema en lugar
+        de una hoja aparte como en Excel.
+        
+        Args:
+            df: DataFrame a convertir (default: df de la instancia)
+        
+        Returns:
+            pyarrow.Table: Tabla con metadata en el esquema
+        """
+        import pyarrow as pa
+        
+        df_export = df if df is not None else self.df
+        
+        if df_export is None:
+            raise ValueError("No hay datos para exportar")
+        
+        tabla = pa.Table.from_pandas(df_export, preserve_index=False)
+        
+        metadata = dict(tabla.schema.metadata or {})
+        metadata.update({
+            b'fecha_exportacion': datetime.now().strftime('%Y-%m-%d %H:%M:%S').encode(),
+            b'total_registros': str(len(df_export)).encode(),
+            b'anio': str(df_export['anio'].iloc[0] if 'anio' in df_export.columns
+                         and len(df_export) else 'N/A').encode(),
+        })
+        return tabla.replace_schema_metadata(metadata)
+    
+    def exportar_parquet(self, df: pd.DataFrame = None) -> BytesIO:
+        """
+        Exporta el DataFrame a Parquet en memoria (intercambio entre módulos).
+        
+        Args:
+            df: DataFrame a exportar (default: df de la instancia)
+        
+        Returns:
+            BytesIO: Buffer con el archivo Parquet
+        """
+        import pyarrow.parquet as pq
         
+        buffer = BytesIO()
+        pq.write_table(self._tabla_arrow(df), buffer, compression='zstd',
+                       use_dictionary=['mes'])
+        buffer.seek(0)
+        return buffer
+    
+    def exportar_feather(self, df: pd.DataFrame = None) -> BytesIO:
+        """
+        Exporta el DataFrame a Feather (Arrow IPC) en memoria.
+        
+        Args:
+            df: DataFrame a exportar (default: df de la instancia)
+        
+        Returns:
+            BytesIO: Buffer con el archivo Feather
+        """
+        import pyarrow.feather as feather
+        
+        buffer = BytesIO()
+        feather.write_feather(self._tabla_arrow(df), buffer, compression='zstd')
         buffer.seek(0)
         return buffer
     
@@ -288,10 +533,21 @@ class DataManager:
         Returns:
             BytesIO: Buffer con la plantilla Excel
         """
-        # Crear DataFrame con columnas y una fila de ejemplo
-        df_plantilla = pd.DataFrame(columns=self.COLUMNAS_BASE)
+        # La plantilla solo depende de las columnas y del año: se serializa una vez
+        clave = (tuple(self.COLUMNAS_BASE), self.anio)
+        if clave not in DataManager._plantillas:
+            DataManager._plantillas[clave] = self._construir_plantilla()
         
-        # Agregar fila de ejemplo
+        return BytesIO(DataManager._plantillas[clave])
+    
+    def _construir_plantilla(self) -> bytes:
+        """
+        Serializa la plantilla Excel con la fila de ejemplo y las instrucciones.
+        
+        Returns:
+            bytes: Contenido del archivo Excel
+        """
+        # Fila de ejemplo
         ejemplo = {
             'mes': 'enero',
             'anio': self.anio,
@@ -320,8 +576,8 @@ class DataManager:
             'ef_auditados': 17,
         }
         
-        df_plantilla = pd.concat([df_plantilla, pd.DataFrame([ejemplo])], 
-                                 ignore_index=True)
+        # Crear DataFrame con las columnas correctas y la fila de ejemplo
+        df_plantilla = pd.DataFrame([ejemplo], columns=self.COLUMNAS_BASE)
         
         buffer = BytesIO()
         
@@ -329,19 +585,30 @@ class DataManager:
             df_plantilla.to_excel(writer, sheet_name='Datos', index=False)
             
             # Agregar hoja de instrucciones
-            from modules.validator import DataValidator
-            descripciones = DataValidator.obtener_descripcion_columnas()
+            self._obtener_instrucciones().to_excel(writer, sheet_name='Instrucciones',
+                                                   index=False)
+        
+        return buffer.getvalue()
+    
+    @classmethod
+    def _obtener_instrucciones(cls) -> pd.DataFrame:
+        """
+        Retorna la tabla de instrucciones de la plantilla (se construye una vez).
+        
+        Returns:
+            pd.DataFrame: Columna, descripción y tipo de cada campo
+        """
+        if cls._instrucciones is None:
+            descripciones = {col: cls.DESCRIPCION_COLUMNAS[col] for col in cls.COLUMNAS_BASE}
             
-            instrucciones = pd.DataFrame({
+            cls._instrucciones = pd.DataFrame({
                 'Columna': list(descripciones.keys()),
                 'Descripción': list(descripciones.values()),
                 'Tipo': ['Texto' if col == 'mes' else 'Número' 
                         for col in descripciones.keys()]
             })
-            instrucciones.to_excel(writer, sheet_name='Instrucciones', index=False)
         
-        buffer.seek(0)
-        return buffer
+        return cls._instrucciones
     
     def obtener_resumen_estadistico(self, df: pd.DataFrame = None) -> Dict:
         """
@@ -372,13 +639,18 @@ class DataManager:
         indicadores = ['IF', 'IG', 'IART', 'OPAS', 'IDPS', 'IDS', 
                       'IENTS', 'IOSEA', 'ICAI', 'IEF', 'IG_TOTAL']
         
-        for ind in indicadores:
-            if ind in df_analisis.columns:
+        presentes = [ind for ind in indicadores if ind in df_analisis.columns]
+        
+        if presentes:
+            # Las cuatro reducciones de todas las columnas en una sola llamada
+            estadisticas = df_analisis[presentes].agg(['mean', 'min', 'max', 'std'])
+            
+            for ind in presentes:
                 resumen['indicadores'][ind] = {
-                    'promedio': df_analisis[ind].mean(),
-                    'minimo': df_analisis[ind].min(),
-                    'maximo': df_analisis[ind].max(),
-                    'desv_std': df_analisis[ind].std(),
+                    'promedio': estadisticas.at['mean', ind],
+                    'minimo': estadisticas.at['min', ind],
+                    'maximo': estadisticas.at['max', ind],
+                    'desv_std': estadisticas.at['std', ind],
                 }
         
         return resumen
@@ -399,7 +671,7 @@ class DataManager:
         Args:
             df: DataFrame a establecer
         """
-        self.df = df.copy()
+        self.df = df.copy(deep=not _COPY_ON_WRITE)
     
     @staticmethod
     def obtener_meses() -> list:
@@ -5,15 +5,116 @@ Genera informes técnicos profesionales de indicadores reactivos y proactivos
 
 from fpdf import FPDF
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, BinaryIO
+from io import BytesIO
+from bisect import bisect_right
 import pandas as pd
-import tempfile
-import os
+
+
+# Sección "Información General": (etiqueta, clave, valor por defecto), dos pares por fila
+_FILAS_EMPRESA = (
+    (("Razón Social", 'razon_social', ''), ("Rep. Legal", 'rep_legal', '')),
+    (("Actividad Económica", 'actividad', ''), ("RUC", 'ruc', '')),
+    (("Dirección", 'direccion', ''), ("N° Sucursales", 'sucursales', '0')),
+    (("Provincia/Cantón/Parr", 'ubicacion', ''), ("N° Trabajadores", 'trabajadores', '0')),
+)
+
+# Sección "Información del Responsable": (etiqueta, clave)
+_FILAS_RESPONSABLE = (
+    ("Nombres y Apellidos", 'nombre'),
+    ("Cédula de Identidad", 'cedula'),
+    ("Cargo en la empresa", 'cargo'),
+    ("Profesión", 'profesion'),
+    ("Registro MRL/SENESCYT", 'registro'),
+)
+
+# Marca de "párrafo aún no dividido" en InformePDF.parrafo (None es un resultado válido)
+_SIN_CALCULAR = object()
+
+
+# Interpretación de indicadores reactivos: (umbrales, (mensaje, tipo) por tramo).
+# Un valor igual al umbral cae en el tramo siguiente (equivale a "valor < umbral")
+_ALERTAS_IF = ((5, 15), (
+    ("EXCELENTE: El IF se encuentra en niveles muy bajos, indicando un control efectivo de la frecuencia de accidentes.", "success"),
+    ("ACEPTABLE: El IF se encuentra en niveles moderados. Se recomienda mantener las medidas preventivas actuales.", "info"),
+    ("ATENCIÓN: El IF indica una alta frecuencia de accidentes. Se requieren acciones correctivas inmediatas.", "danger"),
+))
+_ALERTAS_IG = ((50, 200), (
+    ("Los accidentes registrados presentan baja severidad.", "success"),
+    ("Severidad moderada. Algunos accidentes generan incapacidades significativas.", "warning"),
+    ("CRÍTICO: Alta severidad en los accidentes. Revisar causas de lesiones graves.", "danger"),
+))
+_ALERTAS_TR = ((5, 15), (
+    ("Los accidentes generan incapacidades cortas (lesiones leves).", "success"),
+    ("Gravedad moderada por accidente. Evaluar causas de lesiones.", "warning"),
+    ("ATENCIÓN: Cada accidente genera en promedio más de 15 días de baja.", "danger"),
+))
+
+
+# Secciones 5-7 del informe reactivo (mismo esquema, distinto contenido)
+_SECCIONES_REACTIVAS = (
+    {
+        'titulo': "5. Índice de Frecuencia (IF)",
+        'clave': 'IF',
+        'metrica': 'if_promedio',
+        'unidad': "",
+        'descripcion': """El Índice de Frecuencia (IF) mide la cantidad de lesiones por cada 
+millón (o fracción según K) de horas hombre trabajadas. Es el indicador más utilizado 
+para evaluar la ocurrencia de accidentes en una organización.""",
+        'formula': "Fórmula: IF = (Número de Lesiones x K) / Horas Hombre Trabajadas",
+        'alertas': _ALERTAS_IF,
+    },
+    {
+        'titulo': "6. Índice de Gravedad (IG)",
+        'clave': 'IG',
+        'metrica': 'ig_promedio',
+        'unidad': "",
+        'descripcion': """El Índice de Gravedad (IG) mide la severidad de los accidentes en 
+términos de días perdidos por cada millón de horas trabajadas. A diferencia del IF, 
+el IG refleja no solo la ocurrencia sino la magnitud del impacto de los accidentes.""",
+        'formula': "Fórmula: IG = (Días Perdidos x K) / Horas Hombre Trabajadas",
+        'alertas': _ALERTAS_IG,
+    },
+    {
+        'titulo': "7. Tasa de Riesgo (TR)",
+        'clave': 'TR',
+        'metrica': 'tr_promedio',
+        'unidad': "días/accidente",
+        'descripcion': """La Tasa de Riesgo (TR) representa el promedio de días perdidos por 
+cada accidente ocurrido. Es útil para entender la gravedad promedio de los incidentes 
+independientemente de las horas trabajadas.""",
+        'formula': "Fórmula: TR = IG / IF = Días Perdidos / Número de Lesiones",
+        'alertas': _ALERTAS_TR,
+    },
+)
+
+
+def _clasificar(valor: float, umbrales: tuple, mensajes: tuple) -> tuple:
+    """Retorna el (mensaje, tipo) del tramo al que pertenece el valor (NaN cae en el último)"""
+    return mensajes[bisect_right(umbrales, valor)]
+
+
+def _emitir(pdf: FPDF, salida: Optional[BinaryIO] = None) -> Optional[bytes]:
+    """Escribe el PDF en `salida` si se indicó; si no, lo retorna como bytes"""
+    if salida is not None:
+        pdf.output(salida)
+        return None
+    return bytes(pdf.output())
+
+
+def _filas_mensuales(df: pd.DataFrame, columna: str, formato: str) -> list:
+    """Filas (mes, valor formateado) de una tabla mensual, sin iterar fila a fila"""
+    return list(zip(df['mes'].tolist(), df[columna].map(formato.format).tolist()))
 
 
 class InformePDF(FPDF):
     """Clase base para generación de informes PDF SSO - Formato A4 Profesional Auditable"""
     
+    # Párrafos ya divididos en líneas, compartidos entre informes:
+    # (texto, ancho, estilo, tamaño) -> (línea, ...) o None si requiere multi_cell
+    _lineas_parrafo: Dict[tuple, tuple] = {}
+    _MAX_LINEAS_PARRAFO = 512
+    
     def __init__(self, titulo_informe: str, datos_empresa: Dict[str, str], 
                  datos_responsable: Dict[str, str], datos_aprobacion: Dict[str, str],
                  periodo: str = "2026", codigo: str = "R-SSO-00", version: str = "01"):
@@ -28,6 +129,12 @@ class InformePDF(FPDF):
         self.set_auto_page_break(auto=True, margin=25)
         self.total_pages = 0
         
+        # Fecha de emisión única para todo el informe (encabezados, pies y portada)
+        ahora = datetime.now()
+        self.fecha_reporte = ahora.strftime('%d/%m/%Y')
+        self.fecha_generacion = ahora.strftime('%Y-%m-%d %H:%M')
+        self.fecha_emision = ahora.strftime('%d de %B de %Y')
+        
     def header(self):
         """Encabezado profesional con logos y estructura formal"""
         if self.page_no() > 0:
@@ -52,33 +159,22 @@ class InformePDF(FPDF):
             self.set_xy(160, 22)
             self.cell(40, 8, f'Página {self.page_no()}', border=1, align='C')
             
-            # Segunda fila de metadatos
-            self.set_xy(10, 30)
-            self.set_fill_color(220, 220, 220)
-            self.set_font('Helvetica', 'B', 8)
-            
-            # Fecha Reporte
-            self.cell(25, 6, "Fecha Reporte", border=1, fill=True, align='C')
-            self.set_fill_color(255, 255, 255)
-            self.set_font('Helvetica', '', 8)
-            self.cell(35, 6, datetime.now().strftime('%d/%m/%Y'), border=1, align='C')
-            
-            # Año Reportado
-            self.set_fill_color(220, 220, 220)
-            self.set_font('Helvetica', 'B', 8)
-            self.cell(30, 6, "Año Reportado", border=1, fill=True, align='C')
+            # Segunda fila de metadatos: celdas agrupadas por estilo para cambiar
+            # fuente/relleno una sola vez por grupo (posiciones fijas con set_xy)
+            # Valores (regular, sin relleno); la fuente ya es Helvetica 8
             self.set_fill_color(255, 255, 255)
-            self.set_font('Helvetica', '', 8)
-            self.cell(30, 6, self.periodo, border=1, align='C')
+            for x, ancho, valor in ((35, 35, self.fecha_reporte), (100, 30, self.periodo),
+                                    (150, 10, self.version), (160, 40, self.codigo)):
+                self.set_xy(x, 30)
+                self.cell(ancho, 6, valor, border=1, align='C')
             
-            # Código y Versión
+            # Etiquetas (negrita, fondo gris)
             self.set_fill_color(220, 220, 220)
             self.set_font('Helvetica', 'B', 8)
-            self.cell(20, 6, "Versión", border=1, fill=True, align='C')
-            self.set_fill_color(255, 255, 255)
-            self.set_font('Helvetica', '', 8)
-            self.cell(10, 6, self.version, border=1, align='C')
-            self.cell(40, 6, self.codigo, border=1, align='C')
+            for x, ancho, etiqueta in ((10, 25, "Fecha Reporte"), (70, 30, "Año Reportado"),
+                                       (130, 20, "Versión")):
+                self.set_xy(x, 30)
+                self.cell(ancho, 6, etiqueta, border=1, fill=True, align='C')
             
             self.ln(10)
     
@@ -87,7 +183,7 @@ class InformePDF(FPDF):
         self.set_y(-15)
         self.set_font('Helvetica', 'I', 7)
         self.set_text_color(100, 100, 100)
-        self.cell(0, 10, f"Generado auditada por Dashboard SSO - {datetime.now().strftime('%Y-%m-%d %H:%M')}", align='L')
+        self.cell(0, 10, f"Generado auditada por Dashboard SSO - {self.fecha_generacion}", align='L')
         self.cell(0, 10, f"Página {self.page_no()}", align='R')
 
     def portada(self, tipo: str = "REACTIVOS"):
@@ -144,7 +240,7 @@ class InformePDF(FPDF):
         self.cell(60, 10, 'Fecha de Emisión', border=1, align='C', fill=True)
         self.set_fill_color(255, 255, 255)
         self.set_font('Helvetica', '', 11)
-        self.cell(130, 10, datetime.now().strftime('%d de %B de %Y'), border=1, align='C')
+        self.cell(130, 10, self.fecha_emision, border=1, align='C')
         self.ln()
         
         self.set_font('Helvetica', 'B', 11)
@@ -173,48 +269,14 @@ class InformePDF(FPDF):
         self.set_font('Helvetica', 'B', 8)
         self.set_fill_color(220, 220, 220)
         
-        # Fila 1
-        self.cell(35, 6, "Razón Social", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('razon_social', ''), border=1)
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "Rep. Legal", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('rep_legal', ''), border=1)
-        self.ln()
-        
-        # Fila 2
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "Actividad Económica", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('actividad', ''), border=1)
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "RUC", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('ruc', ''), border=1)
-        self.ln()
-        
-        # Fila 3
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "Dirección", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('direccion', ''), border=1)
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "N° Sucursales", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('sucursales', '0'), border=1)
-        self.ln()
-        
-        # Fila 4
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "Provincia/Cantón/Parr", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('ubicacion', ''), border=1)
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(35, 6, "N° Trabajadores", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(60, 6, self.empresa.get('trabajadores', '0'), border=1)
-        self.ln(10)
+        # Dos pares etiqueta/valor por fila
+        for i, fila in enumerate(_FILAS_EMPRESA):
+            for etiqueta, clave, defecto in fila:
+                self.set_font('Helvetica', 'B', 8)
+                self.cell(35, 6, etiqueta, border=1, fill=True)
+                self.set_font('Helvetica', '', 8)
+                self.cell(60, 6, self.empresa.get(clave, defecto), border=1)
+            self.ln(10 if i == len(_FILAS_EMPRESA) - 1 else None)
 
         # 2. Información del Responsable
         self.set_fill_color(255, 204, 0)
@@ -227,34 +289,12 @@ class InformePDF(FPDF):
         self.set_font('Helvetica', 'B', 8)
         self.set_fill_color(220, 220, 220)
         
-        self.cell(40, 8, "Nombres y Apellidos", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(100, 8, self.responsable.get('nombre', ''), border=1)
-        self.ln()
-        
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(40, 8, "Cédula de Identidad", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(100, 8, self.responsable.get('cedula', ''), border=1)
-        self.ln()
-        
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(40, 8, "Cargo en la empresa", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(100, 8, self.responsable.get('cargo', ''), border=1)
-        self.ln()
-        
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(40, 8, "Profesión", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(100, 8, self.responsable.get('profesion', ''), border=1)
-        self.ln()
-        
-        self.set_font('Helvetica', 'B', 8)
-        self.cell(40, 8, "Registro MRL/SENESCYT", border=1, fill=True)
-        self.set_font('Helvetica', '', 8)
-        self.cell(100, 8, self.responsable.get('registro', ''), border=1)
-        self.ln()
+        for etiqueta, clave in _FILAS_RESPONSABLE:
+            self.set_font('Helvetica', 'B', 8)
+            self.cell(40, 8, etiqueta, border=1, fill=True)
+            self.set_font('Helvetica', '', 8)
+            self.cell(100, 8, self.responsable.get(clave, ''), border=1)
+            self.ln()
         
         self.set_font('Helvetica', 'B', 8)
         self.cell(40, 15, "Firma de Responsabilidad", border=1, fill=True)
@@ -279,13 +319,49 @@ class InformePDF(FPDF):
         self.ln(2)
         self.set_text_color(50, 50, 50)
     
-    def parrafo(self, texto: str):
-        """Agrega un párrafo de texto"""
+    def parrafo(self, texto: str, cachear: bool = True):
+        """
+        Agrega un párrafo de texto.
+        cachear=False para textos con valores del informe: no se repetirán y solo ocuparían la caché.
+        """
         self.set_font('Helvetica', '', 9)
         self.set_text_color(0, 0, 0)
-        self.multi_cell(0, 5, texto)
+        
+        # El ajuste de línea de multi_cell domina el coste del informe; se calcula
+        # una vez por párrafo y, si no hay líneas justificadas, se emiten con cell().
+        # La caché es compartida entre hilos: un solo get() evita leer una clave
+        # que otro hilo acaba de vaciar con clear()
+        ancho = self.w - self.r_margin - self.x
+        clave = (texto, ancho, self.font_style, self.font_size_pt)
+        lineas = InformePDF._lineas_parrafo.get(clave, _SIN_CALCULAR) if cachear else _SIN_CALCULAR
+        if lineas is _SIN_CALCULAR:
+            lineas = self._dividir_parrafo(texto, ancho)
+            if cachear:
+                if len(InformePDF._lineas_parrafo) >= InformePDF._MAX_LINEAS_PARRAFO:
+                    InformePDF._lineas_parrafo.clear()
+                InformePDF._lineas_parrafo[clave] = lineas
+        
+        if lineas is None:
+            self.multi_cell(0, 5, texto)
+        else:
+            for linea in lineas:
+                self.cell(ancho, 5, linea, new_x='LEFT', new_y='NEXT')
         self.ln(3)
     
+    def _dividir_parrafo(self, texto: str, ancho: float) -> Optional[tuple]:
+        """
+        Divide un párrafo en sus líneas explícitas si todas caben en el ancho.
+        Retorna None si alguna requiere ajuste automático: multi_cell justifica esas
+        líneas y cell() no admite justificado.
+        """
+        lineas = []
+        for bloque in texto.split('\n'):
+            partes = self.multi_cell(ancho, 5, bloque, dry_run=True, output='LINES')
+            if len(partes) > 1:
+                return None
+            lineas.append(partes[0])
+        return tuple(lineas)
+    
     def subtitulo(self, texto: str):
         """Agrega un subtítulo"""
         self.set_font('Helvetica', 'B', 9)
@@ -333,34 +409,25 @@ class InformePDF(FPDF):
         self.multi_cell(0, 5, texto, border=1, fill=True)
         self.ln(3)
 
-    def agregar_grafico(self, imagen_bytes: bytes, titulo: str):
-        """Agrega un gráfico desde bytes"""
-        import tempfile
-        import os
-        
+    def agregar_grafico(self, imagen_bytes, titulo: str):
+        """Agrega un gráfico desde bytes o BytesIO (en memoria, sin archivo temporal)"""
         if not imagen_bytes:
             return
             
         self.ln(5)
         self.subtitulo(titulo)
         
-        # Guardar temporalmente
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
-                tmp.write(imagen_bytes)
-                tmp_path = tmp.name
-            
             # Insertar imagen centrado
             # Ancho A4 es 210mm, margenes default 10mm (x=10). Contenido ~190mm
             # Queremos centrar imagen de unos 140mm de ancho
+            # fpdf2 decodifica el BytesIO una vez y reutiliza imágenes repetidas
             x_pos = (210 - 150) / 2
-            self.image(tmp_path, x=x_pos, w=150)
+            datos = imagen_bytes.getvalue() if hasattr(imagen_bytes, 'getvalue') else imagen_bytes
+            self.image(BytesIO(datos), x=x_pos, w=150)
             self.ln(5)
-            
-            # Limpiar
-            os.unlink(tmp_path)
         except Exception as e:
-            self.parrafo(f"Error al incluir gráfico: {str(e)}")
+            self.parrafo(f"Error al incluir gráfico: {str(e)}", cachear=False)
 
     def seccion_firmas(self):
         """Genera la sección de firmas de aprobación"""
@@ -396,6 +463,35 @@ class InformePDF(FPDF):
         self.ln()
 
 
+def _seccion_indicador_reactivo(pdf: "InformePDF", df_charts: pd.DataFrame,
+                                metricas: Dict[str, Any], imagenes: Dict[str, bytes],
+                                seccion: Dict[str, Any]):
+    """Escribe la sección de un indicador reactivo (descripción, resultados, gráfico e interpretación)"""
+    clave = seccion['clave']
+    
+    pdf.seccion_titulo(seccion['titulo'])
+    pdf.subtitulo("Descripción Técnica")
+    pdf.parrafo(seccion['descripcion'])
+    
+    pdf.parrafo(seccion['formula'])
+    
+    pdf.subtitulo("Resultados del Período")
+    promedio = metricas.get(seccion['metrica'], 0)
+    pdf.indicador_valor(f"{clave} Promedio del Período", promedio, seccion['unidad'])
+    
+    # Tabla de valores mensuales
+    if 'mes' in df_charts.columns and clave in df_charts.columns:
+        data = _filas_mensuales(df_charts, clave, '{:.2f}')
+        pdf.tabla_datos(['Mes', clave], data)
+    
+    # Gráfico de evolución
+    if clave in imagenes:
+        pdf.agregar_grafico(imagenes[clave], f"Gráfico de Evolución {clave}")
+    
+    pdf.subtitulo("Interpretación")
+    pdf.alerta(*_clasificar(promedio, *seccion['alertas']))
+
+
 def generar_informe_reactivos(
     df_charts: pd.DataFrame,
     metricas: Dict[str, Any],
@@ -405,9 +501,15 @@ def generar_informe_reactivos(
     imagenes: Dict[str, bytes] = None,
     periodo: str = "2026",
     codigo: str = "R-SSO-IR-00",
-    version: str = "01"
-) -> bytes:
-    """Genera el informe PDF completo de indicadores reactivos"""
+    version: str = "01",
+    salida: Optional[BinaryIO] = None
+) -> Optional[bytes]:
+    """
+    Genera el informe PDF completo de indicadores reactivos.
+    
+    Con `salida` (archivo o buffer binario) el PDF se escribe directamente en ella
+    y se retorna None, sin la copia intermedia a bytes.
+    """
     
     pdf = InformePDF("Reporte Indices Reactivos", datos_empresa, datos_responsable, datos_aprobacion, periodo, codigo, version)
     imagenes = imagenes or {}
@@ -447,7 +549,7 @@ lesiones y días perdidos registrados durante el período de evaluación.""")
     pdf.subtitulo("Alcance del Análisis")
     pdf.parrafo(f"""El análisis comprende el período {periodo}, durante el cual se 
 recopilaron datos de horas hombre trabajadas, número de lesiones (incluyendo accidentes 
-con y sin baja, así como enfermedades ocupacionales) y días perdidos por incapacidad.""")
+con y sin baja, así como enfermedades ocupacionales) y días perdidos por incapacidad.""", cachear=False)
     
     pdf.subtitulo("Constante K")
     pdf.parrafo("""Para el cálculo de los índices se utiliza la constante K, que representa 
@@ -459,96 +561,13 @@ Los valores típicos son K=200,000 (mensual) o K=1,000,000 (anual).""")
 de los resultados depende directamente de la precisión en el registro de accidentes y 
 horas trabajadas. Se recomienda validar periódicamente los datos de entrada.""")
     
-    # === HOJA 5: ÍNDICE DE FRECUENCIA ===
-    pdf.seccion_titulo("5. Índice de Frecuencia (IF)")
-    pdf.subtitulo("Descripción Técnica")
-    pdf.parrafo("""El Índice de Frecuencia (IF) mide la cantidad de lesiones por cada 
-millón (o fracción según K) de horas hombre trabajadas. Es el indicador más utilizado 
-para evaluar la ocurrencia de accidentes en una organización.""")
-    
-    pdf.parrafo("Fórmula: IF = (Número de Lesiones x K) / Horas Hombre Trabajadas")
-    
-    pdf.subtitulo("Resultados del Período")
     if_promedio = metricas.get('if_promedio', 0)
-    pdf.indicador_valor("IF Promedio del Período", if_promedio, "")
-    
-    # Tabla de valores mensuales
-    if 'mes' in df_charts.columns and 'IF' in df_charts.columns:
-        headers = ['Mes', 'IF']
-        data = [[row['mes'], f"{row['IF']:.2f}"] for _, row in df_charts.iterrows()]
-        pdf.tabla_datos(headers, data)
-    
-    # Gráfico IF
-    if 'IF' in imagenes:
-        pdf.agregar_grafico(imagenes['IF'], "Gráfico de Evolución IF")
-        
-    pdf.subtitulo("Interpretación")
-    if if_promedio < 5:
-        pdf.alerta("EXCELENTE: El IF se encuentra en niveles muy bajos, indicando un control efectivo de la frecuencia de accidentes.", "success")
-    elif if_promedio < 15:
-        pdf.alerta("ACEPTABLE: El IF se encuentra en niveles moderados. Se recomienda mantener las medidas preventivas actuales.", "info")
-    else:
-        pdf.alerta("ATENCIÓN: El IF indica una alta frecuencia de accidentes. Se requieren acciones correctivas inmediatas.", "danger")
-    
-    # === HOJA 6: ÍNDICE DE GRAVEDAD ===
-    pdf.seccion_titulo("6. Índice de Gravedad (IG)")
-    pdf.subtitulo("Descripción Técnica")
-    pdf.parrafo("""El Índice de Gravedad (IG) mide la severidad de los accidentes en 
-términos de días perdidos por cada millón de horas trabajadas. A diferencia del IF, 
-el IG refleja no solo la ocurrencia sino la magnitud del impacto de los accidentes.""")
-    
-    pdf.parrafo("Fórmula: IG = (Días Perdidos x K) / Horas Hombre Trabajadas")
-    
-    pdf.subtitulo("Resultados del Período")
     ig_promedio = metricas.get('ig_promedio', 0)
-    pdf.indicador_valor("IG Promedio del Período", ig_promedio, "")
-    
-    if 'mes' in df_charts.columns and 'IG' in df_charts.columns:
-        headers = ['Mes', 'IG']
-        data = [[row['mes'], f"{row['IG']:.2f}"] for _, row in df_charts.iterrows()]
-        pdf.tabla_datos(headers, data)
-        
-    # Gráfico IG
-    if 'IG' in imagenes:
-        pdf.agregar_grafico(imagenes['IG'], "Gráfico de Evolución IG")
-    
-    pdf.subtitulo("Interpretación")
-    if ig_promedio < 50:
-        pdf.alerta("Los accidentes registrados presentan baja severidad.", "success")
-    elif ig_promedio < 200:
-        pdf.alerta("Severidad moderada. Algunos accidentes generan incapacidades significativas.", "warning")
-    else:
-        pdf.alerta("CRÍTICO: Alta severidad en los accidentes. Revisar causas de lesiones graves.", "danger")
-    
-    # === HOJA 7: TASA DE RIESGO ===
-    pdf.seccion_titulo("7. Tasa de Riesgo (TR)")
-    pdf.subtitulo("Descripción Técnica")
-    pdf.parrafo("""La Tasa de Riesgo (TR) representa el promedio de días perdidos por 
-cada accidente ocurrido. Es útil para entender la gravedad promedio de los incidentes 
-independientemente de las horas trabajadas.""")
-    
-    pdf.parrafo("Fórmula: TR = IG / IF = Días Perdidos / Número de Lesiones")
-    
-    pdf.subtitulo("Resultados del Período")
     tr_promedio = metricas.get('tr_promedio', 0)
-    pdf.indicador_valor("TR Promedio del Período", tr_promedio, "días/accidente")
     
-    if 'mes' in df_charts.columns and 'TR' in df_charts.columns:
-        headers = ['Mes', 'TR']
-        data = [[row['mes'], f"{row['TR']:.2f}"] for _, row in df_charts.iterrows()]
-        pdf.tabla_datos(headers, data)
-        
-    # Gráfico TR
-    if 'TR' in imagenes:
-        pdf.agregar_grafico(imagenes['TR'], "Gráfico de Evolución TR")
-    
-    pdf.subtitulo("Interpretación")
-    if tr_promedio < 5:
-        pdf.alerta("Los accidentes generan incapacidades cortas (lesiones leves).", "success")
-    elif tr_promedio < 15:
-        pdf.alerta("Gravedad moderada por accidente. Evaluar causas de lesiones.", "warning")
-    else:
-        pdf.alerta("ATENCIÓN: Cada accidente genera en promedio más de 15 días de baja.", "danger")
+    # === HOJAS 5-7: ÍNDICES DE FRECUENCIA, GRAVEDAD Y TASA DE RIESGO ===
+    for seccion in _SECCIONES_REACTIVAS:
+        _seccion_indicador_reactivo(pdf, df_charts, metricas, imagenes, seccion)
     
     # === HOJA 8: ANÁLISIS INTEGRADO ===
     pdf.seccion_titulo("8. Análisis Integrado de Indicadores Reactivos")
@@ -560,11 +579,11 @@ de la siniestralidad organizacional:""")
     total_lesiones = metricas.get('total_lesiones', 0)
     total_dias = metricas.get('total_dias', 0)
     
-    pdf.parrafo(f"- Total de lesiones registradas en el período: {int(total_lesiones)}")
-    pdf.parrafo(f"- Total de días perdidos: {int(total_dias)}")
-    pdf.parrafo(f"- Índice de Frecuencia promedio: {if_promedio:.2f}")
-    pdf.parrafo(f"- Índice de Gravedad promedio: {ig_promedio:.2f}")
-    pdf.parrafo(f"- Tasa de Riesgo promedio: {tr_promedio:.2f}")
+    pdf.parrafo(f"- Total de lesiones registradas en el período: {int(total_lesiones)}", cachear=False)
+    pdf.parrafo(f"- Total de días perdidos: {int(total_dias)}", cachear=False)
+    pdf.parrafo(f"- Índice de Frecuencia promedio: {if_promedio:.2f}", cachear=False)
+    pdf.parrafo(f"- Índice de Gravedad promedio: {ig_promedio:.2f}", cachear=False)
+    pdf.parrafo(f"- Tasa de Riesgo promedio: {tr_promedio:.2f}", cachear=False)
     
     pdf.subtitulo("Evaluación Global")
     if if_promedio < 5 and ig_promedio < 50:
@@ -580,7 +599,7 @@ de la siniestralidad organizacional:""")
         texto_eval = "Existen oportunidades de mejora en el control de accidentes y su severidad."
         tipo_alerta = "warning"
     
-    pdf.parrafo(f"Estado general de siniestralidad: {evaluacion}")
+    pdf.parrafo(f"Estado general de siniestralidad: {evaluacion}", cachear=False)
     pdf.alerta(texto_eval, tipo_alerta)
     
     # === HOJA 9: CONCLUSIONES Y FIRMAS ===
@@ -588,13 +607,13 @@ de la siniestralidad organizacional:""")
     
     pdf.subtitulo("Conclusiones")
     pdf.parrafo(f"""1. El Índice de Frecuencia promedio de {if_promedio:.2f} indica que 
-{'la frecuencia de accidentes se mantiene controlada' if if_promedio < 10 else 'existe una frecuencia significativa de accidentes que requiere atención'}.""")
+{'la frecuencia de accidentes se mantiene controlada' if if_promedio < 10 else 'existe una frecuencia significativa de accidentes que requiere atención'}.""", cachear=False)
     
     pdf.parrafo(f"""2. El Índice de Gravedad promedio de {ig_promedio:.2f} refleja 
-{'una severidad baja en los accidentes ocurridos' if ig_promedio < 100 else 'una severidad considerable que impacta la productividad'}.""")
+{'una severidad baja en los accidentes ocurridos' if ig_promedio < 100 else 'una severidad considerable que impacta la productividad'}.""", cachear=False)
     
     pdf.parrafo(f"""3. La Tasa de Riesgo de {tr_promedio:.2f} días por accidente 
-{'es aceptable para las operaciones' if tr_promedio < 10 else 'sugiere la necesidad de mejorar los controles preventivos'}.""")
+{'es aceptable para las operaciones' if tr_promedio < 10 else 'sugiere la necesidad de mejorar los controles preventivos'}.""", cachear=False)
     
     pdf.subtitulo("Recomendaciones")
     pdf.parrafo("""1. Mantener y fortalecer los programas de capacitación en seguridad 
@@ -612,8 +631,7 @@ reactivos como parte del plan de mejora continua del sistema de gestión de SSO.
     # Firmas
     pdf.seccion_firmas()
     
-    # Generar bytes
-    return bytes(pdf.output())
+    return _emitir(pdf, salida)
 
 
 def generar_informe_proactivos(
@@ -625,9 +643,15 @@ def generar_informe_proactivos(
     imagenes: Dict[str, bytes] = None,
     periodo: str = "2026",
     codigo: str = "R-SSO-IP-00",
-    version: str = "01"
-) -> bytes:
-    """Genera el informe PDF completo de indicadores proactivos"""
+    version: str = "01",
+    salida: Optional[BinaryIO] = None
+) -> Optional[bytes]:
+    """
+    Genera el informe PDF completo de indicadores proactivos.
+    
+    Con `salida` (archivo o buffer binario) el PDF se escribe directamente en ella
+    y se retorna None, sin la copia intermedia a bytes.
+    """
     
     pdf = InformePDF("Reporte Indices Proactivos", datos_empresa, datos_responsable, datos_aprobacion, periodo, codigo, version)
     imagenes = imagenes or {}
@@ -665,11 +689,11 @@ durante el período de evaluación.""")
     meta_general = metas.get('general', 80)
     pdf.parrafo(f"""La meta establecida para los indicadores proactivos es del {meta_general}%. 
 Este valor es configurable según las políticas de cada organización y puede ajustarse 
-de acuerdo al nivel de madurez del sistema de gestión de SSO.""")
+de acuerdo al nivel de madurez del sistema de gestión de SSO.""", cachear=False)
     
     pdf.subtitulo("Criterios de Evaluación")
-    pdf.parrafo(f"""- Cumplimiento >= {meta_general}%: El indicador se considera SATISFACTORIO""")
-    pdf.parrafo(f"""- Cumplimiento < {meta_general}%: El indicador requiere ATENCIÓN y acciones correctivas""")
+    pdf.parrafo(f"""- Cumplimiento >= {meta_general}%: El indicador se considera SATISFACTORIO""", cachear=False)
+    pdf.parrafo(f"""- Cumplimiento < {meta_general}%: El indicador requiere ATENCIÓN y acciones correctivas""", cachear=False)
     
     # Gráfico de Cumplimiento General
     if 'barras_resumen' in imagenes:
@@ -766,7 +790,7 @@ Mide la relación entre las capacitaciones ejecutadas y las programadas en el pe
             
             # Tabla mensual
             headers = ['Mes', ind_key.upper()]
-            data = [[row['mes'], f"{row[ind_key]:.1f}%"] for _, row in df_resultados.iterrows()]
+            data = _filas_mensuales(df_resultados, ind_key, '{:.1f}%')
             pdf.tabla_datos(headers, data)
             
             # Evaluación
@@ -791,7 +815,7 @@ Mide la relación entre las capacitaciones ejecutadas y las programadas en el pe
         cumplimiento_count = sum(1 for p in promedios if p >= meta_general)
         
         pdf.indicador_valor("Promedio General de Cumplimiento", promedio_general)
-        pdf.parrafo(f"Indicadores que cumplen la meta: {cumplimiento_count} de {len(indicadores_cols)}")
+        pdf.parrafo(f"Indicadores que cumplen la meta: {cumplimiento_count} de {len(indicadores_cols)}", cachear=False)
         
         if promedio_general >= 90:
             nivel = "ALTO"
@@ -806,7 +830,7 @@ Mide la relación entre las capacitaciones ejecutadas y las programadas en el pe
             descripcion = "Se requiere fortalecer significativamente las acciones preventivas."
             tipo = "danger"
         
-        pdf.parrafo(f"Nivel de madurez preventiva: {nivel}")
+        pdf.parrafo(f"Nivel de madurez preventiva: {nivel}", cachear=False)
         pdf.alerta(descripcion, tipo)
         
         # Gráfico Evolución IG Total
@@ -817,7 +841,7 @@ Mide la relación entre las capacitaciones ejecutadas y las programadas en el pe
         pdf.subtitulo("Indicadores con Oportunidad de Mejora")
         for i, col in enumerate(indicadores_cols):
             if promedios[i] < meta_general:
-                pdf.parrafo(f"- {col.upper()}: {promedios[i]:.1f}% (brecha de {meta_general - promedios[i]:.1f}%)")
+                pdf.parrafo(f"- {col.upper()}: {promedios[i]:.1f}% (brecha de {meta_general - promedios[i]:.1f}%)", cachear=False)
     
     pdf.subtitulo("Impacto en Indicadores Reactivos")
     pdf.parrafo("""El nivel de cumplimiento de los indicadores proactivos tiene un impacto 
@@ -830,10 +854,10 @@ la probabilidad de accidentes y, por tanto, mejora los índices IF, IG y TR.""")
     pdf.subtitulo("Conclusiones")
     if indicadores_cols:
         pdf.parrafo(f"""1. El promedio general de cumplimiento de indicadores proactivos es 
-de {promedio_general:.1f}%, lo que indica un nivel {nivel.lower()} de gestión preventiva.""")
+de {promedio_general:.1f}%, lo que indica un nivel {nivel.lower()} de gestión preventiva.""", cachear=False)
         
         pdf.parrafo(f"""2. De los {len(indicadores_cols)} indicadores evaluados, {cumplimiento_count} 
-cumplen con la meta establecida del {meta_general}%.""")
+cumplen con la meta establecida del {meta_general}%.""", cachear=False)
     
     pdf.parrafo("""3. Las brechas identificadas en los indicadores proactivos representan 
 riesgos potenciales que podrían manifestarse como accidentes futuros si no se corrigen.""")
@@ -853,6 +877,4 @@ de desempeño y reconocimiento del personal.""")
     
     pdf.seccion_firmas()
     
-    # Generar bytes
-    return bytes(pdf.output())
-
+    return _emitir(pdf, salida)
@@ -173,18 +173,22 @@ class ProactiveCalculator:
         # Calcular columnas intermedias para OPAS e IDPS
         df = self._calcular_columnas_compuestas(df)
         
+        # Numeradores y denominadores extraídos una sola vez como arrays (ausentes = 0),
+        # una fila por indicador; sin df.apply ni row.get por fila
+        configs = list(self.INDICADORES.values())
+        numeradores = df.reindex(columns=[c.col_numerador for c in configs], fill_value=0)
+        denominadores = df.reindex(columns=[c.col_denominador for c in configs], fill_value=0)
+        porcentajes = self._calcular_indicador(
+            numeradores.to_numpy(dtype=np.float64).T,
+            denominadores.to_numpy(dtype=np.float64).T
+        )
+        
         # Calcular cada indicador
-        for codigo, config in self.INDICADORES.items():
-            df[codigo] = df.apply(
-                lambda row: self._calcular_indicador(
-                    row.get(config.col_numerador, 0),
-                    row.get(config.col_denominador, 0)
-                ),
-                axis=1
-            )
+        for codigo, valores in zip(self.INDICADORES, porcentajes):
+            df[codigo] = valores
         
         # Calcular IG_TOTAL (ponderado)
-        df['IG_TOTAL'] = df.apply(self._calcular_ig_total, axis=1)
+        df['IG_TOTAL'] = self._calcular_ig_total(porcentajes)
         
         # Agregar columna de meta
         df['Meta'] = self.meta
@@ -268,55 +272,46 @@ class ProactiveCalculator:
         
         return df
     
-    def _calcular_indicador(self, numerador: float, denominador: float) -> float:
+    def _calcular_indicador(self, numerador: np.ndarray, denominador: np.ndarray) -> np.ndarray:
         """
-        Calcula un indicador porcentual.
+        Calcula indicadores porcentuales elemento a elemento.
         
         Fórmula: (Numerador / Denominador) * 100
         
         Args:
-            numerador: Valor del numerador
-            denominador: Valor del denominador
+            numerador: Array de numeradores
+            denominador: Array de denominadores
             
         Returns:
-            float: Porcentaje calculado (0-100+)
+            np.ndarray: Porcentajes calculados (tope 100); 0 donde el denominador
+            es 0/NaN o el resultado no es finito
         """
-        try:
-            if denominador == 0 or pd.isna(denominador):
-                return 0.0
-            resultado = (numerador / denominador) * 100
-            return 0.0 if pd.isna(resultado) or np.isinf(resultado) else min(resultado, 100.0)
-        except (ZeroDivisionError, TypeError, ValueError):
-            return 0.0
+        resultado = np.zeros(np.broadcast(numerador, denominador).shape, dtype=np.float64)
+        np.divide(numerador, denominador, out=resultado, where=(denominador != 0) & ~np.isnan(denominador))
+        resultado *= 100
+        resultado[~np.isfinite(resultado)] = 0.0
+        return np.minimum(resultado, 100.0, out=resultado)
     
-    def _calcular_ig_total(self, row: pd.Series) -> float:
+    def _calcular_ig_total(self, porcentajes: np.ndarray) -> np.ndarray:
         """
         Calcula el Índice de Gestión Total ponderado.
         
         Fórmula: (5*IART + 3*OPAS + 2*IDPS + 3*IDS + 1*IENTS + 4*IOSEA + 4*ICAI) / 22
         
         Args:
-            row: Fila del DataFrame
+            porcentajes: Matriz (indicadores, meses) en el orden de INDICADORES
             
         Returns:
-            float: IG_TOTAL calculado
+            np.ndarray: IG_TOTAL calculado por mes
         """
-        try:
-            suma_ponderada = 0
-            suma_pesos = 0
-            
-            for codigo, config in self.INDICADORES.items():
-                if config.peso > 0:
-                    suma_ponderada += config.peso * row.get(codigo, 0)
-                    suma_pesos += config.peso
-            
-            if suma_pesos == 0:
-                return 0.0
-            
-            return suma_ponderada / suma_pesos
-            
-        except (TypeError, ValueError):
-            return 0.0
+        pesos = np.array([config.peso for config in self.INDICADORES.values()], dtype=np.float64)
+        suma_pesos = pesos.sum()
+        
+        if suma_pesos == 0:
+            return np.zeros(porcentajes.shape[1], dtype=np.float64)
+        
+        # Los indicadores con peso 0 (IEF) no aportan a la suma ponderada
+        return pesos @ porcentajes / suma_pesos
     
     def obtener_estadisticas(self) -> Dict:
         """
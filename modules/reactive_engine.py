@@ -7,6 +7,7 @@ de filas de resumen trimestral y anual, usando constantes K variables
 según el período de análisis.
 """
 
+import math
 import pandas as pd
 import numpy as np
 from typing import Tuple, Dict, Optional
@@ -171,11 +172,10 @@ class ReactiveAnalyzer:
         
         # Calcular Total de Horas
         # Si horas_hombre_mes tiene valor, usar ese; sino calcular
-        df['total_horas'] = df.apply(
-            lambda row: row['horas_hombre_mes'] 
-            if row['horas_hombre_mes'] > 0 
-            else (row['num_trabajadores'] * self.HORAS_MENSUALES_STD) + row['horas_extras'],
-            axis=1
+        df['total_horas'] = np.where(
+            df['horas_hombre_mes'] > 0,
+            df['horas_hombre_mes'],
+            (df['num_trabajadores'] * self.HORAS_MENSUALES_STD) + df['horas_extras']
         )
         
         # Normalizar mes a minúsculas
@@ -204,32 +204,20 @@ class ReactiveAnalyzer:
         # Usar constante K mensual
         K = self.K.MENSUAL
         
-        # Índice de Frecuencia (IF)
-        df['IF'] = df.apply(
-            lambda row: self._safe_divide(
-                row['total_lesiones'] * K,
-                row['total_horas']
-            ),
-            axis=1
-        )
+        # Columnas como arrays float64 (cálculo vectorizado, sin apply por fila)
+        total_lesiones = df['total_lesiones'].to_numpy(dtype=np.float64)
+        total_horas = df['total_horas'].to_numpy(dtype=np.float64)
+        dias_perdidos = df['dias_perdidos'].to_numpy(dtype=np.float64)
         
-        # Índice de Gravedad (IG)
-        df['IG'] = df.apply(
-            lambda row: self._safe_divide(
-                row['dias_perdidos'] * K,
-                row['total_horas']
-            ),
-            axis=1
-        )
+        # Índice de Frecuencia (IF) e Índice de Gravedad (IG): comparten denominador,
+        # así que K / horas se divide una sola vez y ambos índices solo multiplican
+        factor_horas = self._safe_divide_array(K, total_horas)
+        indices = np.vstack([total_lesiones, dias_perdidos]) * factor_horas
+        indices[~np.isfinite(indices)] = 0.0
+        df['IF'], df['IG'] = indices
         
         # Tasa de Riesgo (TR)
-        df['TR'] = df.apply(
-            lambda row: self._safe_divide(
-                row['dias_perdidos'],
-                row['total_lesiones']
-            ),
-            axis=1
-        )
+        df['TR'] = self._safe_divide_array(dias_perdidos, total_lesiones)
         
         # Marcar como fila de mes
         df['tipo_fila'] = 'mes'
@@ -350,14 +338,34 @@ class ReactiveAnalyzer:
         Returns:
             float: Resultado de la división o 0 si hay error
         """
+        # Sin llamadas a pandas/NumPy por valor: un NaN en el denominador da un
+        # resultado no finito y los tipos no numéricos (None, pd.NA, str) caen en el except
         try:
-            if denominador == 0 or pd.isna(denominador):
+            if denominador == 0:
                 return 0.0
             resultado = numerador / denominador
-            return 0.0 if pd.isna(resultado) or np.isinf(resultado) else resultado
+            return resultado if math.isfinite(resultado) else 0.0
         except (ZeroDivisionError, TypeError, ValueError):
             return 0.0
     
+    @staticmethod
+    def _safe_divide_array(numerador: np.ndarray, denominador: np.ndarray) -> np.ndarray:
+        """
+        Versión vectorizada de _safe_divide para arrays completos.
+        
+        Args:
+            numerador: Array de numeradores
+            denominador: Array de denominadores
+            
+        Returns:
+            np.ndarray: Resultado elemento a elemento; 0 donde el denominador
+            es 0/NaN o el resultado no es finito
+        """
+        resultado = np.zeros(np.broadcast(numerador, denominador).shape, dtype=np.float64)
+        np.divide(numerador, denominador, out=resultado, where=(denominador != 0) & ~np.isnan(denominador))
+        resultado[~np.isfinite(resultado)] = 0.0
+        return resultado
+    
     def obtener_estadisticas(self) -> Dict:
         """
         Obtiene estadísticas resumidas del análisis.
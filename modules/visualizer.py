@@ -8,6 +8,9 @@ Características:
 - render_proactive_dashboard(): Gráfico combo con barras de cumplimiento y línea de meta
 """
 
+import io
+import threading
+from contextlib import contextmanager
 import pandas as pd
 import numpy as np
 import streamlit as st
@@ -16,6 +19,91 @@ from plotly.subplots import make_subplots
 from typing import Optional, Dict, List, Tuple, Any
 
 
+# Figuras matplotlib reutilizadas entre informes: figuras libres por clave. Cada llamada
+# toma una propia (nunca se comparte entre hilos) y la devuelve al terminar
+_FIG_POOL: Dict[str, List[Any]] = {}
+_FIG_POOL_LOCK = threading.Lock()
+
+# El render de texto usa objetos FreeType compartidos por todo el proceso: solo el
+# layout y el guardado a PNG se serializan
+_RENDER_LOCK = threading.Lock()
+
+# Tamaños de fuente de los gráficos del PDF, fijados en cada artista (sin tocar rcParams)
+_FUENTE = 9
+_FUENTE_TITULO = 10.8
+
+
+@contextmanager
+def _figura(key: str, figsize: Tuple[float, float] = (8, 4)):
+    """Presta una figura limpia del pool para la clave (se crea fuera de pyplot si no hay libres)"""
+    from matplotlib.figure import Figure
+    
+    with _FIG_POOL_LOCK:
+        libres = _FIG_POOL.setdefault(key, [])
+        fig = libres.pop() if libres else None
+    
+    if fig is None:
+        fig = Figure(figsize=figsize)
+    else:
+        fig.clf()
+    
+    try:
+        yield fig
+    finally:
+        with _FIG_POOL_LOCK:
+            _FIG_POOL[key].append(fig)
+
+
+def _ejes(fig, titulo: str, eje_y: str):
+    """Crea los ejes de la figura con título, etiqueta Y y marcas en los tamaños de fuente del informe"""
+    ax = fig.add_subplot(111)
+    ax.set_title(titulo, fontsize=_FUENTE_TITULO)
+    ax.set_ylabel(eje_y, fontsize=_FUENTE)
+    ax.tick_params(labelsize=_FUENTE)
+    return ax
+
+
+def _optimizar_png(datos: bytes) -> bytes:
+    """
+    Reduce un gráfico PNG a paleta de 256 colores.
+    
+    Los gráficos de matplotlib usan unos cientos de tonos (antialiasing) sobre fondo
+    opaco: con paleta, fpdf incrusta 1 byte por píxel en lugar de 4 (RGBA) y sin
+    máscara alfa, lo que reduce el PDF a menos de la mitad.
+    """
+    from PIL import Image
+    
+    img = Image.open(io.BytesIO(datos))
+    
+    if img.mode not in ('RGB', 'RGBA'):
+        return datos
+    
+    # Canal alfa completamente opaco: se descarta para no generar máscara
+    if img.mode == 'RGBA' and img.getextrema()[3] == (255, 255):
+        img = img.convert('RGB')
+    
+    salida = io.BytesIO()
+    img.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(
+        salida, format='PNG', optimize=True)
+    return salida.getvalue()
+
+
+def _fig_a_png(fig) -> io.BytesIO:
+    """
+    Ajusta el layout y guarda la figura como PNG en paleta (sin cerrarla: vuelve al pool).
+    La cuantización ocurre aquí, una vez por gráfico, para que las imágenes cacheadas ya
+    lleguen listas para incrustar en el PDF.
+    """
+    import matplotlib
+    
+    buf = io.BytesIO()
+    with _RENDER_LOCK:
+        # El margen de tight_layout se mide en tamaños de fuente de rcParams: 1.08 con fuente 9
+        fig.tight_layout(pad=1.08 * _FUENTE / matplotlib.rcParams['font.size'])
+        fig.savefig(buf, format='png', dpi=100)
+    return io.BytesIO(_optimizar_png(buf.getvalue()))
+
+
 class SSOVisualizer:
     """
     Visualizador de Dashboard SSO v2.0
@@ -42,6 +130,9 @@ class SSOVisualizer:
         'anual_bg': '#a0a0a0',      # Gris medio para fila anual
     }
     
+    # A partir de este número de filas el Excel se exporta con pyexcelerate
+    FILAS_EXPORTACION_RAPIDA = 5000
+    
     # Nombres de meses en español
     MESES_ES = {
         1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
@@ -505,136 +596,82 @@ class SSOVisualizer:
     
     def generar_imagenes_reactivas(self, df: pd.DataFrame) -> Dict[str, bytes]:
         """Genera gráficos estáticos para el reporte PDF reactivo"""
-        import matplotlib.pyplot as plt
-        import io
-        
         imagenes = {}
         
         if df.empty or 'mes' not in df.columns:
             return imagenes
-            
-        # Configurar estilo
-        plt.style.use('default')
-        plt.rcParams.update({'font.size': 9, 'figure.figsize': (8, 4)})
         
-        # 1. Índice de Frecuencia
-        if 'IF' in df.columns:
-            fig, ax = plt.subplots()
-            ax.plot(df['mes'], df['IF'], marker='o', linestyle='-', color='#e74c3c', linewidth=2)
-            ax.set_title('Evolución Índice de Frecuencia (IF)')
-            ax.set_ylabel('Índice')
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100)
-            buf.seek(0)
-            imagenes['IF'] = buf
-            plt.close(fig)
-            
-        # 2. Índice de Gravedad
-        if 'IG' in df.columns:
-            fig, ax = plt.subplots()
-            ax.plot(df['mes'], df['IG'], marker='s', linestyle='-', color='#f39c12', linewidth=2)
-            ax.set_title('Evolución Índice de Gravedad (IG)')
-            ax.set_ylabel('Índice')
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100)
-            buf.seek(0)
-            imagenes['IG'] = buf
-            plt.close(fig)
-            
-        # 3. Tasa de Riesgo
-        if 'TR' in df.columns:
-            fig, ax = plt.subplots()
-            ax.plot(df['mes'], df['TR'], marker='^', linestyle='-', color='#9b59b6', linewidth=2)
-            ax.set_title('Evolución Tasa de Riesgo (TR)')
-            ax.set_ylabel('Días / Accidente')
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
+        # Gráfico de línea por índice: (columna, marcador, color, título, eje Y)
+        graficos = [
+            ('IF', 'o', '#e74c3c', 'Evolución Índice de Frecuencia (IF)', 'Índice'),
+            ('IG', 's', '#f39c12', 'Evolución Índice de Gravedad (IG)', 'Índice'),
+            ('TR', '^', '#9b59b6', 'Evolución Tasa de Riesgo (TR)', 'Días / Accidente'),
+        ]
+        
+        for columna, marcador, color, titulo, eje_y in graficos:
+            if columna not in df.columns:
+                continue
             
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100)
-            buf.seek(0)
-            imagenes['TR'] = buf
-            plt.close(fig)
+            with _figura(f'reactivo_{columna}') as fig:
+                ax = _ejes(fig, titulo, eje_y)
+                ax.plot(df['mes'], df[columna], marker=marcador, linestyle='-', color=color, linewidth=2)
+                ax.grid(True, alpha=0.3)
+                ax.tick_params(axis='x', labelrotation=45)
+                
+                imagenes[columna] = _fig_a_png(fig)
             
         return imagenes
 
     def generar_imagenes_proactivas(self, df: pd.DataFrame, metas: Dict[str, float]) -> Dict[str, bytes]:
         """Genera gráficos estáticos para el reporte PDF proactivo"""
-        import matplotlib.pyplot as plt
-        import io
-        
         imagenes = {}
         indicadores = ['iart', 'opas', 'idps', 'ids', 'ients', 'iosea', 'icai', 'ig_total']
         presentes = [ind for ind in indicadores if ind in df.columns]
         
         if not presentes:
             return imagenes
-            
-        plt.style.use('default')
-        plt.rcParams.update({'font.size': 9})
         
         # 1. Barras de Cumplimiento Promedio vs Meta
-        fig, ax = plt.subplots(figsize=(8, 4))
-        
-        promedios = [df[ind].mean() for ind in presentes]
-        nombres = [ind.upper() for ind in presentes]
-        metas_vals = [metas.get(ind, metas.get('general', 80)) for ind in presentes]
-        
-        colores = ['#2ecc71' if p >= m else '#e74c3c' for p, m in zip(promedios, metas_vals)]
-        
-        bars = ax.bar(nombres, promedios, color=colores, alpha=0.7)
-        
-        # Líneas de meta
-        for i, meta in enumerate(metas_vals):
-            ax.hlines(y=meta, xmin=i-0.4, xmax=i+0.4, colors='gray', linestyles='--', linewidth=1.5)
+        with _figura('proactivo_barras') as fig:
+            ax = _ejes(fig, 'Cumplimiento Promedio por Indicador', 'Cumplimiento (%)')
             
-        ax.set_title('Cumplimiento Promedio por Indicador')
-        ax.set_ylabel('Cumplimiento (%)')
-        ax.set_ylim(0, 110)
-        
-        # Etiquetas
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.1f}%', ha='center', va='bottom', fontsize=8)
-        
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', dpi=100)
-        buf.seek(0)
-        imagenes['barras_resumen'] = buf
-        plt.close(fig)
-        
-        # 2. Evolución IG Total
-        if 'ig_total' in df.columns:
-            fig, ax = plt.subplots(figsize=(8, 4))
-            ax.plot(df['mes'], df['ig_total'], marker='o', linestyle='-', color='#1f77b4', linewidth=2)
+            promedios = [df[ind].mean() for ind in presentes]
+            nombres = [ind.upper() for ind in presentes]
+            metas_vals = [metas.get(ind, metas.get('general', 80)) for ind in presentes]
+            
+            colores = ['#2ecc71' if p >= m else '#e74c3c' for p, m in zip(promedios, metas_vals)]
+            
+            bars = ax.bar(nombres, promedios, color=colores, alpha=0.7)
             
-            meta_ig = metas.get('ig_total', 80)
-            ax.axhline(y=meta_ig, color='gray', linestyle='--', alpha=0.7, label=f'Meta {meta_ig}%')
+            # Líneas de meta
+            for i, meta in enumerate(metas_vals):
+                ax.hlines(y=meta, xmin=i-0.4, xmax=i+0.4, colors='gray', linestyles='--', linewidth=1.5)
+                
+            ax.set_ylim(0, 110)
             
-            ax.set_title('Evolución Índice de Gestión Total (IG Total)')
-            ax.set_ylabel('Cumplimiento (%)')
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.ylim(0, 110)
-            plt.tight_layout()
+            # Etiquetas
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height,
+                        f'{height:.1f}%', ha='center', va='bottom', fontsize=8)
             
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100)
-            buf.seek(0)
-            imagenes['evolucion_ig'] = buf
-            plt.close(fig)
+            imagenes['barras_resumen'] = _fig_a_png(fig)
+        
+        # 2. Evolución IG Total
+        if 'ig_total' in df.columns:
+            with _figura('proactivo_evolucion_ig') as fig:
+                ax = _ejes(fig, 'Evolución Índice de Gestión Total (IG Total)', 'Cumplimiento (%)')
+                ax.plot(df['mes'], df['ig_total'], marker='o', linestyle='-', color='#1f77b4', linewidth=2)
+                
+                meta_ig = metas.get('ig_total', 80)
+                ax.axhline(y=meta_ig, color='gray', linestyle='--', alpha=0.7, label=f'Meta {meta_ig}%')
+                
+                ax.legend(fontsize=_FUENTE)
+                ax.grid(True, alpha=0.3)
+                ax.tick_params(axis='x', labelrotation=45)
+                ax.set_ylim(0, 110)
+                
+                imagenes['evolucion_ig'] = _fig_a_png(fig)
             
         return imagenes
     
@@ -703,13 +740,32 @@ class SSOVisualizer:
         df_proactivo: Optional[pd.DataFrame] = None,
         nombre_archivo: str = "reporte_sso.xlsx"
     ) -> bytes:
-        """Exporta los datos a Excel"""
+        """Exporta los datos a Excel (pyexcelerate para tablas grandes si está instalado)"""
         import io
+        hojas = {
+            'Indicadores Reactivos': df_reactivo,
+            'Indicadores Proactivos': df_proactivo,
+        }
+        hojas = {nombre: df for nombre, df in hojas.items() if df is not None}
+        
         output = io.BytesIO()
+        if max((len(df) for df in hojas.values()), default=0) > self.FILAS_EXPORTACION_RAPIDA:
+            try:
+                from pyexcelerate import Workbook
+            except ImportError:
+                Workbook = None
+            
+            if Workbook is not None:
+                # Escritura en bloque: una lista 2D por hoja, sin objetos celda intermedios
+                wb = Workbook()
+                for nombre, df in hojas.items():
+                    valores = df.astype(object).where(df.notna(), None).values.tolist()
+                    wb.new_sheet(nombre, data=[df.columns.tolist()] + valores)
+                wb.save(output)
+                return output.getvalue()
+        
         with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            if df_reactivo is not None:
-                df_reactivo.to_excel(writer, sheet_name='Indicadores Reactivos', index=False)
-            if df_proactivo is not None:
-                df_proactivo.to_excel(writer, sheet_name='Indicadores Proactivos', index=False)
+            for nombre, df in hojas.items():
+                df.to_excel(writer, sheet_name=nombre, index=False)
         output.seek(0)
         return output.getvalue()